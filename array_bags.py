@@ -11,11 +11,13 @@ class ArrayBag(AbstractBag):
     DEFAULT_CAPACITY = 10
 
     # Constructor
-    def __init__(self, source_collection=None):
+    def __init__(self, source_collection=None, typecode=None):
         """
         Sets the initial state of self, which includes the
         contents of source_collection, if it's present.
+        If typecode is given, items are kept in a typed Array.
         """
+        self.typecode = typecode
         self.clear()
         self.target_index = -1
         AbstractBag.__init__(self, source_collection)
@@ -54,7 +56,7 @@ class ArrayBag(AbstractBag):
         """
         Void self.
         """
-        self.items = Array(ArrayBag.DEFAULT_CAPACITY)
+        self.items = Array(ArrayBag.DEFAULT_CAPACITY, typecode=self.typecode)
         self.size = 0
 
     def add(self, item):
@@ -77,8 +79,8 @@ class ArrayBag(AbstractBag):
             raise KeyError(f"{item} not in bag.")
         # (2) During the last checking, self.target_index is already
         #     point to the designated item, simply remove it.
-        for index in range(self.target_index, len(self) - 1):
-            self.items[index] = self.items[index + 1]
+        index = self.target_index
+        self.items.move_block(index + 1, index, len(self) - index - 1)
         # (4) Decrease logical size by 1
         self.size -= 1
         # (5) Check array memory here and decrease it if necessary
@@ -94,8 +96,8 @@ class ArraySortedBag(ArrayBag):
     Inherent most methods from ArrayBag.
     """
 
-    def __init__(self, source_collection=None):
-        ArrayBag.__init__(self, source_collection=source_collection)
+    def __init__(self, source_collection=None, typecode=None):
+        ArrayBag.__init__(self, source_collection=source_collection, typecode=typecode)
 
     # Accessor methods
     def __contains__(self, item):
@@ -153,7 +155,6 @@ class ArraySortedBag(ArrayBag):
                 else:
                     left = mid + 1
                     target_index = left
-            for index in range(len(self) - 1, target_index - 1, -1):
-                self.items[index + 1] = self.items[index]
+            self.items.move_block(target_index, target_index + 1, len(self) - target_index)
             self.items[target_index] = item
             self.size += 1
@@ -1,11 +1,22 @@
+from array import array
+
+
 class Array(object):
-    def __init__(self, capacity, fill_value=None):
-        self.items = list()
+    """
+    A fixed-capacity array with a logical size.
+    If typecode is given (e.g. "q", "d"), the items are stored
+    in a compact typed buffer from the stdlib array module
+    instead of a list of Python objects.
+    """
+
+    def __init__(self, capacity, fill_value=None, typecode=None):
+        if typecode is not None and fill_value is None:
+            fill_value = 0
+        self.typecode = typecode
         self.fill_value = fill_value
         self.logical_size = 0
         self.capacity = capacity
-        for k in range(capacity):
-            self.items.append(fill_value)
+        self.items = self.make_items(capacity)
 
     def __len__(self):
         return len(self.items)
@@ -41,24 +52,85 @@ class Array(object):
     def size(self):
         return self.logical_size
 
+    def is_typed(self):
+        """
+        Returns True if self stores items in a typed buffer, or False otherwise.
+        """
+        return self.typecode is not None
+
+    def view(self):
+        """
+        Returns a zero-copy memoryview over all physical slots of self.
+        Precondition: self is typed.
+        Raises TypeError if self stores Python objects.
+        Note: self cannot grow or shrink while the view is alive.
+        """
+        if not self.is_typed():
+            raise TypeError("Only typed arrays can be viewed as a buffer.")
+        return memoryview(self.items)
+
+    def __buffer__(self, flags):
+        """
+        Supports the buffer protocol (Python 3.12+), e.g. numpy.asarray(self).
+        """
+        return self.view()
+
+    def __release_buffer__(self, view):
+        view.release()
+
+    def make_items(self, count):
+        """
+        Helper method for building count slots of fill_value
+        in the storage type of self.
+        """
+        if self.typecode is None:
+            return [self.fill_value] * count
+        return array(self.typecode, [self.fill_value]) * count
+
+    def move_block(self, src, dst, length):
+        """
+        Copies length items starting at src to the slots starting at dst
+        with a single slice assignment. Overlapping blocks are handled.
+        """
+        if length <= 0:
+            return
+        if min(src, dst) < 0 or max(src, dst) + length > len(self):
+            raise IndexError(f"Array block move {src}>{dst}:{length} out of range.")
+        self.items[dst:dst + length] = self.items[src:src + length]
+
+    def fill_range(self, start, stop):
+        """
+        Resets the slots from start up to stop (exclusive) to fill_value.
+        """
+        if start < 0 or stop > len(self):
+            raise IndexError(f"Array fill range {start}:{stop} out of range.")
+        if start < stop:
+            self.items[start:stop] = self.make_items(stop - start)
+
+    def reserve(self, n):
+        """
+        Makes sure that self has at least n physical slots.
+        Grows geometrically so that repeated calls are amortized O(1).
+        """
+        if n > len(self):
+            new_size = max(n, 2 * len(self))
+            self.items.extend(self.make_items(new_size - len(self)))
+
     def grow(self):
-        for k in range(len(self)):
-            self.items.append(self.fill_value)
+        self.reserve(2 * len(self))
 
     def shrink(self):
         new_size = max(self.capacity, len(self) // 2)
-        for k in range(len(self) - new_size):
-            self.items.pop()
+        del self.items[new_size:]
 
     def insert(self, k, new_item):
-        if self.size() == len(self) - 1:
-            self.grow()
+        # Always keep one spare slot after the logical end.
+        self.reserve(self.size() + 2)
         if k > self.size():
             self.items[self.size()] = new_item
         else:
             k = max(k, 0)
-            for ind in range(self.size() - 1, k - 1, -1):
-                self.items[ind + 1] = self.items[ind]
+            self.move_block(k, k + 1, self.size() - k)
             self.items[k] = new_item
         self.logical_size += 1
 
@@ -69,8 +141,7 @@ class Array(object):
         if k < 0 or k >= self.size():
             raise IndexError(f"Array pop index {k} out of range.")
         data = self.items[k]
-        for ind in range(k, self.size()):
-            self.items[ind] = self.items[ind + 1]
+        self.move_block(k + 1, k, self.size() - k - 1)
         self.items[self.size() - 1] = self.fill_value
         self.logical_size -= 1
         if self.logical_size < len(self) // 4 and len(self) >= 2 * self.capacity:
@@ -0,0 +1,268 @@
+import math
+
+from arrays import Array
+from nodes import HashNode
+
+
+class ChainedHashTable(object):
+    """
+    A hash table with bucket/chaining to resolve collisions.
+    Every bucket holds a chain of HashNodes, which cache the hash of
+    their key, so rehashing never calls hash() again.
+    Nodes hold Entry objects if has_values is True, or bare keys otherwise.
+    Used by HashDict, HashBag and HashSet.
+
+    If incremental is True, rehashing keeps the old and new bucket arrays
+    side by side and every mutation moves a few buckets over.
+    If power_of_two is True, the capacity is rounded up to a power of two
+    and buckets are picked with a bit mask instead of a modulo.
+    Removals halve the capacity whenever the load factor drops below
+    low_water (0 disables it), but never below the initial capacity.
+    """
+
+    # Class variables
+    # Number of old buckets moved per mutation during incremental rehashing.
+    MIGRATION_STEP = 4
+    # Empty old buckets skipped per moved bucket during incremental rehashing.
+    EMPTY_VISITS = 10
+
+    # Constructor
+    def __init__(self, capacity, has_values=True, max_load_factor=0.5, low_water=0,
+                 incremental=False, power_of_two=False):
+        self.has_values = has_values
+        self.max_load_factor = max_load_factor
+        self.low_water = low_water
+        self.incremental = incremental
+        self.power_of_two = power_of_two
+        self.capacity = self.min_capacity = self.round_capacity(capacity)
+        self.buckets = Array(self.capacity)
+        self.old_buckets = None
+        self.migrate_index = 0
+        self.size = 0
+        self.hash_code = None
+        self.found_buckets = self.buckets
+        self.index = -1
+        self.found_node = self.prior_node = None
+
+    # Accessors
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """
+        Supports iteration over the data (Entry objects or keys) in self.
+        """
+        bucket_arrays = [self.buckets]
+        if self.old_buckets is not None:
+            bucket_arrays.insert(0, self.old_buckets)
+        for bucket_array in bucket_arrays:
+            for index in range(len(bucket_array)):
+                node = bucket_array[index]
+                while node is not None:
+                    yield node.data
+                    node = node.next
+
+    def search(self, key):
+        """
+        Returns True if key is in self, or False otherwise.
+        Record hash_code, found_buckets, index, prior_node and found_node
+        during the process for further use.
+        If key is not found, found_buckets and index point to
+        the bucket where it should be added.
+        """
+        self.hash_code = hash(key)
+        if self.old_buckets is not None:
+            self.found_buckets = self.old_buckets
+            if self.search_bucket(key):
+                return True
+        self.found_buckets = self.buckets
+        return self.search_bucket(key)
+
+    def search_bucket(self, key):
+        """
+        Helper method for searching key in its bucket of self.found_buckets.
+        Compares the cached hashes before comparing the keys.
+        """
+        self.index = self.bucket_index(self.hash_code, self.found_buckets)
+        self.prior_node = None
+        self.found_node = self.found_buckets[self.index]
+        while self.found_node is not None:
+            if self.found_node.hash_code == self.hash_code:
+                data = self.found_node.data
+                if (data.key if self.has_values else data) == key:
+                    return True
+            self.prior_node = self.found_node
+            self.found_node = self.found_node.next
+        return False
+
+    def bucket_index(self, hash_code, bucket_array):
+        """
+        Helper method for finding the bucket of hash_code in bucket_array.
+        With power-of-two capacities, the high bits of the hash are folded
+        into the low ones before masking, so keys that only differ in
+        their high bits (e.g. multiples of 1024) still spread out.
+        """
+        if self.power_of_two:
+            hash_code ^= hash_code >> 32
+            hash_code ^= (hash_code >> 20) ^ (hash_code >> 12)
+            hash_code ^= (hash_code >> 7) ^ (hash_code >> 4)
+            return hash_code & (len(bucket_array) - 1)
+        return abs(hash_code) % len(bucket_array)
+
+    def round_capacity(self, capacity):
+        """
+        Helper method for rounding capacity up to a power of two,
+        if self uses power-of-two capacities.
+        """
+        if self.power_of_two:
+            return 1 << max(capacity - 1, 0).bit_length()
+        return capacity
+
+    def capacity_for(self, count):
+        """
+        Returns the smallest capacity that holds count keys without rehashing.
+        """
+        return self.round_capacity(max(1, math.ceil(count / self.max_load_factor)))
+
+    def load_factor(self):
+        """
+        Returns the load factor of self.
+        """
+        return self.size / self.capacity
+
+    def is_rehashing(self):
+        """
+        Returns True if an incremental rehash is in progress, or False otherwise.
+        """
+        return self.old_buckets is not None
+
+    # Mutators
+    def insert(self, data, hash_code):
+        """
+        Adds data with hash_code at the head of its chain in the new buckets,
+        and rehashes self if the load factor is over max_load_factor.
+        """
+        self.index = self.bucket_index(hash_code, self.buckets)
+        self.buckets[self.index] = HashNode(data, hash_code, self.buckets[self.index])
+        self.grow_if_full()
+
+    def insert_found(self, data):
+        """
+        Adds data where the last search says its key should be,
+        and rehashes self if the load factor is over max_load_factor.
+        Precondition: the last search returned False.
+        """
+        self.found_buckets[self.index] = HashNode(data, self.hash_code,
+                                                  self.found_buckets[self.index])
+        self.grow_if_full()
+
+    def remove_found(self):
+        """
+        Removes the node found by the last search,
+        and shrinks self if the load factor drops below low_water.
+        Precondition: the last search returned True.
+        """
+        if self.prior_node is None:
+            self.found_buckets[self.index] = self.found_node.next
+        else:
+            self.prior_node.next = self.found_node.next
+        self.size -= 1
+        self.shrink_if_sparse()
+
+    def grow_if_full(self):
+        """
+        Helper method for counting a new node and doubling the capacity
+        once the load factor is over max_load_factor.
+        """
+        self.size += 1
+        if self.load_factor() > self.max_load_factor:
+            self.rehash()
+
+    def shrink_if_sparse(self):
+        """
+        Helper method for halving the capacity once the load factor
+        drops below low_water, but not below the initial capacity.
+        Waits while an incremental rehash is in progress, so a shrink never
+        has to finish the previous migration in one go; the next removal
+        after the migration is done checks again.
+        """
+        if self.is_rehashing():
+            return
+        if self.load_factor() < self.low_water and self.capacity > self.min_capacity:
+            self.rehash(max(self.min_capacity, self.capacity // 2))
+
+    def reserve(self, count):
+        """
+        Makes room for count keys in total, so adding them won't rehash.
+        """
+        capacity = self.capacity_for(count)
+        if capacity > self.capacity:
+            self.rehash(capacity)
+
+    def compact(self):
+        """
+        Shrinks the capacity to fit the current size
+        and finishes any incremental rehash in progress.
+        """
+        capacity = self.capacity_for(self.size)
+        if capacity < self.capacity:
+            self.rehash(capacity)
+        self.finish_migration()
+
+    def rehash(self, capacity=None):
+        """
+        Changes the capacity (doubles it by default)
+        and moves all nodes to the new buckets.
+        In incremental mode, only starts the move; see migrate.
+        """
+        self.finish_migration()
+        self.capacity = self.capacity * 2 if capacity is None else self.round_capacity(capacity)
+        self.old_buckets = self.buckets
+        self.buckets = Array(self.capacity)
+        self.migrate_index = 0
+        if not self.incremental or self.size == 0:
+            self.finish_migration()
+
+    def finish_migration(self):
+        """
+        Finishes the incremental rehash in progress, if any.
+        """
+        if self.old_buckets is not None:
+            self.migrate(len(self.old_buckets))
+
+    def migrate(self, step=None):
+        """
+        Moves up to step non-empty buckets (MIGRATION_STEP by default)
+        from the old bucket array into the new one.
+        By default, also skips up to EMPTY_VISITS empty buckets per moved one,
+        so sparse old arrays (e.g. after a shrink) finish in time.
+        Uses the cached hashes, so hash() is never called again.
+        """
+        if self.old_buckets is None:
+            return
+        if step is None:
+            step = ChainedHashTable.MIGRATION_STEP
+            empty_visits = step * ChainedHashTable.EMPTY_VISITS
+        else:
+            empty_visits = step
+        old_index = self.migrate_index
+        while old_index < len(self.old_buckets) and step > 0:
+            node = self.old_buckets[old_index]
+            if node is None:
+                if empty_visits == 0:
+                    break
+                empty_visits -= 1
+            else:
+                step -= 1
+            while node is not None:
+                next_node = node.next
+                index = self.bucket_index(node.hash_code, self.buckets)
+                node.next = self.buckets[index]
+                self.buckets[index] = node
+                node = next_node
+            self.old_buckets[old_index] = None
+            old_index += 1
+        self.migrate_index = old_index
+        if old_index == len(self.old_buckets):
+            self.old_buckets = None
+            self.found_buckets = self.buckets
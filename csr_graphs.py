@@ -0,0 +1,280 @@
+from arrays import Array
+from grid import Grid
+from queues import HeapPriorityQueue
+
+# Same infinity sentinel as linked_directed_graph.INF
+INF = "-"
+
+# The snapshot a worker process runs its queries on, set once by init_worker.
+worker_snapshot = None
+
+
+def init_worker(snapshot):
+    """
+    Process pool initializer: keeps the snapshot for all later tasks,
+    so it's sent to each worker once instead of once per task.
+    """
+    global worker_snapshot
+    worker_snapshot = snapshot
+
+
+def worker_shortest_paths(start_label):
+    """
+    Process pool task: returns (start_label, shortest paths grid)
+    computed on the worker's snapshot.
+    """
+    return start_label, worker_snapshot.shortest_paths(start_label)
+
+
+class CSRGraph(object):
+    """
+    An immutable snapshot of a LinkedDirectedGraph
+    in compressed sparse row (CSR) form.
+    Vertices are numbered 0 .. n-1 in the graph's iteration order.
+    The edges of vertex v are targets[offsets[v]:offsets[v + 1]],
+    with weights in the same positions of weights.
+    """
+
+    # Constructor
+    def __init__(self, graph):
+        self.labels = [vertex.get_label() for vertex in graph]
+        self.label_table = {label: k for k, label in enumerate(self.labels)}
+        edge_count = graph.size_edges()
+        self.offsets = Array(len(self.labels) + 1, typecode="q")
+        self.targets = Array(edge_count, typecode="q")
+        weight_list = []
+        position = 0
+        for k, vertex in enumerate(graph):
+            self.offsets[k] = position
+            for edge in vertex.incident_edges():
+                self.targets[position] = self.label_table[edge.get_to_vertex().get_label()]
+                weight_list.append(edge.get_weight())
+                position += 1
+        self.offsets[len(self.labels)] = position
+        self.weights = self.make_weights(weight_list)
+
+    @staticmethod
+    def make_weights(weight_list):
+        """
+        Helper method for storing the weights in the most compact Array.
+        Uses "q" for integers, "d" for floats and plain objects otherwise.
+        """
+        if all(type(weight) is int for weight in weight_list):
+            typecode = "q"
+        elif all(type(weight) in (int, float) for weight in weight_list):
+            typecode = "d"
+        else:
+            typecode = None
+        weights = Array(len(weight_list), typecode=typecode)
+        for k, weight in enumerate(weight_list):
+            weights[k] = weight
+        return weights
+
+    # Accessors
+    def __len__(self):
+        """
+        Returns the number of vertices in self.
+        """
+        return len(self.labels)
+
+    def __str__(self):
+        return f"CSRGraph({len(self)} vertices, {self.size_edges()} edges)"
+
+    def size_edges(self):
+        """
+        Returns the number of edges in self.
+        """
+        return len(self.targets)
+
+    def contains_vertex(self, label):
+        """
+        Returns True if the label is in self, or False otherwise.
+        """
+        return label in self.label_table
+
+    def get_id(self, label):
+        """
+        Returns the vertex number of the label.
+        Precondition: The label is in self.
+        Raises AttributeError if the label is not in self.
+        """
+        vertex_id = self.label_table.get(label, None)
+        if vertex_id is None:
+            raise AttributeError(f"Vertex {label} is not in the graph.")
+        return vertex_id
+
+    def get_label(self, vertex_id):
+        """
+        Returns the label of the vertex number.
+        """
+        return self.labels[vertex_id]
+
+    def neighbors(self, vertex_id):
+        """
+        Returns the vertex numbers of all neighbors of vertex_id.
+        """
+        offsets = self.offsets.items
+        return self.targets.items[offsets[vertex_id]:offsets[vertex_id + 1]]
+
+    def neighboring_labels(self, label):
+        """
+        Returns an iterator of the labels of all neighbors of the label.
+        """
+        return map(self.get_label, self.neighbors(self.get_id(label)))
+
+    def breadth_first(self, start_label):
+        """
+        Traverse the graph from the starting vertex using BFS.
+        Returns a list of labels.
+        """
+        offsets = self.offsets.items
+        targets = self.targets.items
+        start = self.get_id(start_label)
+        visited = bytearray(len(self))
+        visited[start] = 1
+        order = [start]
+        # order doubles as the queue: cursor points to its front.
+        cursor = 0
+        while cursor < len(order):
+            v = order[cursor]
+            cursor += 1
+            for w in targets[offsets[v]:offsets[v + 1]]:
+                if not visited[w]:
+                    visited[w] = 1
+                    order.append(w)
+        return [self.labels[v] for v in order]
+
+    def depth_first(self, start_label):
+        """
+        Traverse the graph from the starting vertex using DFS.
+        Returns a list of labels in the same order as
+        LinkedDirectedGraph.depth_first.
+        """
+        offsets = self.offsets.items
+        targets = self.targets.items
+        start = self.get_id(start_label)
+        visited = bytearray(len(self))
+        visited[start] = 1
+        order = [start]
+        # Each stack entry is (vertex, position of its next edge).
+        stack = [(start, offsets[start])]
+        while stack:
+            v, position = stack[-1]
+            end = offsets[v + 1]
+            while position < end and visited[targets[position]]:
+                position += 1
+            if position == end:
+                stack.pop()
+            else:
+                w = targets[position]
+                stack[-1] = (v, position + 1)
+                visited[w] = 1
+                order.append(w)
+                stack.append((w, offsets[w]))
+        return [self.labels[v] for v in order]
+
+    def topological_sort(self):
+        """
+        Returns a list of labels after topological sorting,
+        in the same order as LinkedDirectedGraph.topological_sort.
+        """
+        offsets = self.offsets.items
+        targets = self.targets.items
+        visited = bytearray(len(self))
+        finished = []
+        for root in range(len(self)):
+            if visited[root]:
+                continue
+            visited[root] = 1
+            stack = [(root, offsets[root])]
+            while stack:
+                v, position = stack[-1]
+                end = offsets[v + 1]
+                while position < end and visited[targets[position]]:
+                    position += 1
+                if position == end:
+                    stack.pop()
+                    finished.append(v)
+                else:
+                    w = targets[position]
+                    stack[-1] = (v, position + 1)
+                    visited[w] = 1
+                    stack.append((w, offsets[w]))
+        return [self.labels[v] for v in reversed(finished)]
+
+    def has_path(self, start_label, to_label):
+        """
+        Returns True if there's a path between two vertices, or False otherwise.
+        """
+        if not (self.contains_vertex(start_label) and self.contains_vertex(to_label)):
+            return False
+        offsets = self.offsets.items
+        targets = self.targets.items
+        start = self.label_table[start_label]
+        target = self.label_table[to_label]
+        visited = bytearray(len(self))
+        visited[start] = 1
+        stack = [start]
+        while stack:
+            v = stack.pop()
+            for w in targets[offsets[v]:offsets[v + 1]]:
+                if w == target:
+                    return True
+                if not visited[w]:
+                    visited[w] = 1
+                    stack.append(w)
+        return False
+
+    def iter_shortest_paths(self, start_label):
+        """
+        Runs Dijkstra algorithm from the starting vertex with a binary heap.
+        Yields (label, distance, predecessor label) for every reachable vertex
+        in the order the vertices are settled.
+        """
+        offsets = self.offsets.items
+        targets = self.targets.items
+        weights = self.weights.items
+        start = self.get_id(start_label)
+        dist = [None] * len(self)
+        pred = [-1] * len(self)
+        settled = bytearray(len(self))
+        dist[start] = 0
+        # The counter breaks ties in insertion order,
+        # just like LinkedDirectedGraph.iter_shortest_paths.
+        counter = 0
+        queue = HeapPriorityQueue()
+        queue.add((0, counter, start))
+        while not queue.is_empty():
+            this_dist, _, v = queue.pop()
+            if settled[v]:
+                continue
+            settled[v] = 1
+            yield self.labels[v], this_dist, None if pred[v] < 0 else self.labels[pred[v]]
+            for position in range(offsets[v], offsets[v + 1]):
+                w = targets[position]
+                if settled[w]:
+                    continue
+                new_dist = this_dist + weights[position]
+                if dist[w] is None or new_dist < dist[w]:
+                    dist[w] = new_dist
+                    pred[w] = v
+                    counter += 1
+                    queue.add((new_dist, counter, w))
+
+    def shortest_paths(self, start_label, target_label=None):
+        """
+        Returns the shortest paths from starting vertex using Dijkstra algorithm,
+        in the same Grid shape as LinkedDirectedGraph.shortest_paths.
+        """
+        result = Grid(len(self), 3)
+        for row, label in enumerate(self.labels):
+            result[row, 0] = label
+            result[row, 1] = INF
+            result[row, 2] = None
+        for label, dist, pred_label in self.iter_shortest_paths(start_label):
+            row = self.label_table[label]
+            result[row, 1] = dist
+            result[row, 2] = pred_label
+            if label == target_label:
+                break
+        return result
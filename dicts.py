@@ -1,9 +1,14 @@
+import math
+import threading
+
 from abstract_dict import Entry, AbstractDict
 from arrays import Array
 from array_list import ArraySortedList, ArrayList
 from linked_lists import AltLinkedList
 from linked_bst import LinkedBST
-from nodes import Node
+from nodes import HashNode
+from chained_hash_tables import ChainedHashTable
+from open_hash_tables import OpenHashTable
 
 
 class ArraySortedDict(AbstractDict):
@@ -211,44 +216,48 @@ class LinkedDict(AbstractDict):
 class HashDict(AbstractDict):
     """
     A dictionary implementation based on hashing
-    with bucket/chaining to resolve collisions.
+    with bucket/chaining to resolve collisions (see ChainedHashTable).
+    If incremental is True, rehashing keeps the old and new bucket arrays
+    side by side and every mutation moves a few buckets over,
+    so no single insertion has to move the whole dict.
+    If power_of_two is True, the capacity is rounded up to a power of two
+    and buckets are picked with a bit mask instead of a modulo.
+    Popping keys halves the capacity whenever the load factor drops
+    below low_water (LOW_WATER by default, 0 disables it),
+    but never below the initial capacity.
     """
 
     # Class Variable
     DEFAULT_CAPACITY = 29
+    MAX_LOAD_FACTOR = 0.5
+    LOW_WATER = 0.125
 
     # Constructor
-    def __init__(self, keys=None, values=None, capacity=None):
+    def __init__(self, keys=None, values=None, capacity=None, incremental=False,
+                 power_of_two=False, low_water=None):
         self.capacity = HashDict.DEFAULT_CAPACITY if capacity is None else capacity
-        self.array = Array(self.capacity)
-        self.found_node = self.prior_node = None
-        self.index = -1
+        self.incremental = incremental
+        self.power_of_two = power_of_two
+        self.low_water = HashDict.LOW_WATER if low_water is None else low_water
+        self.clear()
+        if capacity is None and hasattr(keys, "__len__"):
+            self.reserve(len(keys))
         AbstractDict.__init__(self, keys, values)
 
     # Accessors
     def __contains__(self, key):
         """
         Returns True if key is in self, or False otherwise.
+        The search is recorded in self.table for further use.
         """
-        self.index = abs(hash(key)) % len(self.array)
-        self.prior_node = None
-        self.found_node = self.array[self.index]
-        while self.found_node is not None:
-            if key == self.found_node.data.key:
-                return True
-            self.prior_node = self.found_node
-            self.found_node = self.found_node.next
-        return False
+        return self.table.search(key)
 
     def __iter__(self):
         """
         Supports iteration over a view of self.
         """
-        for index in range(len(self.array)):
-            node = self.array[index]
-            while node is not None:
-                yield node.data.key
-                node = node.next
+        for entry in self.table:
+            yield entry.key
 
     def __getitem__(self, key):
         """
@@ -257,7 +266,7 @@ class HashDict(AbstractDict):
         Raises KeyError if the key is not in self.
         """
         if key in self:
-            return self.found_node.data.value
+            return self.table.found_node.data.value
         else:
             raise KeyError(f"Missing key: {key}")
 
@@ -265,64 +274,384 @@ class HashDict(AbstractDict):
         """
         Returns the load factor of self.
         """
-        return self.size / self.capacity
+        return self.table.load_factor()
+
+    def is_rehashing(self):
+        """
+        Returns True if an incremental rehash is in progress, or False otherwise.
+        """
+        return self.table.is_rehashing()
 
     # Mutators
     def clear(self):
-        self.array = Array(self.capacity)
-        self.found_node = self.prior_node = None
-        self.index = -1
+        """
+        Makes self become empty.
+        """
+        self.table = ChainedHashTable(self.capacity, has_values=True,
+                                      max_load_factor=HashDict.MAX_LOAD_FACTOR,
+                                      low_water=self.low_water, incremental=self.incremental,
+                                      power_of_two=self.power_of_two)
         self.size = 0
 
     def __setitem__(self, key, value):
         """
         If the key is not in self, add a new entry with the key and value.
         Otherwise, replace the old value of key with the new value.
-        Rehash the dict if the load factor is over 0.5.
+        Rehash the dict if the load factor is over MAX_LOAD_FACTOR.
         """
+        self.table.migrate()
         if key in self:
-            self.found_node.data.value = value
+            self.table.found_node.data.value = value
         else:
-            new_node = Node(Entry(key, value), self.array[self.index])
-            self.array[self.index] = new_node
+            self.table.insert_found(Entry(key, value))
             self.size += 1
-        while self.load_factor() > 0.5:
-            self.rehash()
 
     def pop(self, key):
         """
         Removes the key and returns the value associated with key.
+        Shrinks the dict if the load factor drops below low_water.
         Precondition: The key is in self.
         Raises KeyError if the key is not in self.
         """
+        self.table.migrate()
         if key in self:
-            value = self.found_node.data.value
-            if self.prior_node is None:
-                self.array[self.index] = None
-            else:
-                self.prior_node.next = self.found_node.next
+            value = self.table.found_node.data.value
+            self.table.remove_found()
             self.size -= 1
             return value
         else:
             raise KeyError(f"Missing key: {key}")
 
-    def rehash(self):
+    def reserve(self, count):
+        """
+        Makes room for count entries in total, so adding them won't rehash.
+        """
+        self.table.reserve(count)
+
+    def compact(self):
         """
-        Increases the capacity by 2 and reload all entries.
+        Shrinks the capacity to fit the current size
+        and finishes any incremental rehash in progress.
         """
-        # Extract all entries
-        entries = []
-        for index in range(len(self.array)):
-            node = self.array[index]
+        self.table.compact()
+
+
+class OpenHashDict(AbstractDict):
+    """
+    A dictionary implementation based on hashing
+    with open addressing (see OpenHashTable).
+    Keeps no Node or Entry objects, and iterates in insertion order.
+    """
+
+    # Constructor
+    def __init__(self, keys=None, values=None, capacity=None):
+        self.capacity = OpenHashTable.DEFAULT_CAPACITY if capacity is None else capacity
+        self.clear()
+        AbstractDict.__init__(self, keys, values)
+
+    # Accessors
+    def __contains__(self, key):
+        """
+        Returns True if key is in self, or False otherwise.
+        """
+        return self.table.find_slot(key, hash(key))[1] >= 0
+
+    def __iter__(self):
+        """
+        Supports iteration over a view of self.
+        """
+        for position in self.table:
+            yield self.table.keys[position]
+
+    def __getitem__(self, key):
+        """
+        Returns the value associated with key.
+        Precondition: The key is in self.
+        Raises KeyError if the key is not in self.
+        """
+        position = self.table.find_slot(key, hash(key))[1]
+        if position < 0:
+            raise KeyError(f"Missing key: {key}")
+        return self.table.values[position]
+
+    def load_factor(self):
+        """
+        Returns the load factor of self.
+        """
+        return self.table.load_factor()
+
+    # Mutators
+    def clear(self):
+        """
+        Makes self become empty.
+        """
+        self.table = OpenHashTable(self.capacity)
+        self.size = 0
+
+    def __setitem__(self, key, value):
+        """
+        If the key is not in self, add a new entry with the key and value.
+        Otherwise, replace the old value of key with the new value.
+        """
+        hash_code = hash(key)
+        slot, position = self.table.find_slot(key, hash_code)
+        if position >= 0:
+            self.table.values[position] = value
+        else:
+            self.table.insert(slot, key, value, hash_code)
+            self.size += 1
+
+    def pop(self, key):
+        """
+        Removes the key and returns the value associated with key.
+        Precondition: The key is in self.
+        Raises KeyError if the key is not in self.
+        """
+        slot, position = self.table.find_slot(key, hash(key))
+        if position < 0:
+            raise KeyError(f"Missing key: {key}")
+        value = self.table.values[position]
+        self.table.delete(slot, position)
+        self.size -= 1
+        return value
+
+
+class ConcurrentHashDict(AbstractDict):
+    """
+    A thread-safe dictionary implementation based on hashing
+    with bucket/chaining to resolve collisions.
+    The buckets are split into stripes (segments), each covering its own
+    range of hash codes with its own bucket array, size and lock.
+    Writers only lock the stripe of their key, and rehash it on their own.
+    Lookups take no lock and keep no state on self: writers only link in
+    fully built nodes, and rehashing builds new chains before swapping
+    the bucket array, so a concurrent reader always walks a valid chain.
+    """
+
+    # Class Variable
+    DEFAULT_CAPACITY = 64
+    DEFAULT_STRIPES = 16
+    MAX_LOAD_FACTOR = 0.5
+
+    # Constructor
+    def __init__(self, keys=None, values=None, capacity=None, stripes=None):
+        self.capacity = ConcurrentHashDict.DEFAULT_CAPACITY if capacity is None else capacity
+        self.stripes = ConcurrentHashDict.DEFAULT_STRIPES if stripes is None else stripes
+        self.locks = [threading.Lock() for _ in range(self.stripes)]
+        self.clear()
+        AbstractDict.__init__(self, keys, values)
+
+    # Accessors
+    def __len__(self):
+        """
+        Returns the number of entries in self.
+        """
+        return sum(self.sizes)
+
+    def __contains__(self, key):
+        """
+        Returns True if key is in self, or False otherwise.
+        """
+        return self.find_node(key, hash(key)) is not None
+
+    def find_node(self, key, hash_code):
+        """
+        Helper method for finding the node of key, or None if key is not in self.
+        Only uses local variables, so any number of threads can search at once.
+        """
+        position, stripe = divmod(abs(hash_code), self.stripes)
+        buckets = self.buckets[stripe]
+        node = buckets[position % len(buckets)]
+        while node is not None:
+            if node.hash_code == hash_code and key == node.data.key:
+                return node
+            node = node.next
+        return None
+
+    def __iter__(self):
+        """
+        Supports iteration over a view of self.
+        Entries changed during the iteration may or may not be seen.
+        """
+        for entry in self.iter_entries():
+            yield entry.key
+
+    def iter_entries(self):
+        """
+        Helper method for iterating over the live Entry objects in self.
+        """
+        for stripe in range(self.stripes):
+            buckets = self.buckets[stripe]
+            for index in range(len(buckets)):
+                node = buckets[index]
+                while node is not None:
+                    yield node.data
+                    node = node.next
+
+    def values(self):
+        """
+        Returns an iterator on the values in self.
+        """
+        return map(lambda entry: entry.value, self.iter_entries())
+
+    def entries(self):
+        """
+        Returns an iterator on the entries in self.
+        """
+        return map(lambda entry: Entry(entry.key, entry.value), self.iter_entries())
+
+    def __getitem__(self, key):
+        """
+        Returns the value associated with key.
+        Precondition: The key is in self.
+        Raises KeyError if the key is not in self.
+        """
+        node = self.find_node(key, hash(key))
+        if node is None:
+            raise KeyError(f"Missing key: {key}")
+        return node.data.value
+
+    def get(self, key, default_value=None):
+        """
+        Returns the value associated with key is key is present in self,
+        or default_value otherwise.
+        """
+        node = self.find_node(key, hash(key))
+        return default_value if node is None else node.data.value
+
+    def load_factor(self):
+        """
+        Returns the load factor of self.
+        """
+        return len(self) / sum(len(buckets) for buckets in self.buckets)
+
+    # Mutators
+    def clear(self):
+        """
+        Makes self become empty.
+        """
+        for lock in self.locks:
+            lock.acquire()
+        try:
+            stripe_capacity = max(1, math.ceil(self.capacity / self.stripes))
+            self.buckets = [Array(stripe_capacity) for _ in range(self.stripes)]
+            self.sizes = [0] * self.stripes
+        finally:
+            for lock in self.locks:
+                lock.release()
+
+    def __setitem__(self, key, value):
+        """
+        If the key is not in self, add a new entry with the key and value.
+        Otherwise, replace the old value of key with the new value.
+        """
+        hash_code = hash(key)
+        with self.locks[abs(hash_code) % self.stripes]:
+            node = self.find_node(key, hash_code)
+            if node is None:
+                self.insert(key, value, hash_code)
+            else:
+                node.data.value = value
+
+    def pop(self, key):
+        """
+        Removes the key and returns the value associated with key.
+        Precondition: The key is in self.
+        Raises KeyError if the key is not in self.
+        """
+        hash_code = hash(key)
+        with self.locks[abs(hash_code) % self.stripes]:
+            node = self.find_node(key, hash_code)
+            if node is None:
+                raise KeyError(f"Missing key: {key}")
+            self.unlink(node, hash_code)
+            return node.data.value
+
+    def get_or_set(self, key, value):
+        """
+        Atomically returns the value associated with key,
+        or adds key with value and returns value if key is not in self.
+        """
+        hash_code = hash(key)
+        node = self.find_node(key, hash_code)
+        if node is not None:
+            return node.data.value
+        with self.locks[abs(hash_code) % self.stripes]:
+            # Another thread may have added key since the lookup above.
+            node = self.find_node(key, hash_code)
+            if node is not None:
+                return node.data.value
+            self.insert(key, value, hash_code)
+            return value
+
+    def compute(self, key, function):
+        """
+        Atomically replaces the value of key with function(key, old_value),
+        where old_value is None if key is not in self, and returns the new value.
+        If the new value is None, key is removed instead.
+        Precondition: function doesn't modify self.
+        """
+        hash_code = hash(key)
+        with self.locks[abs(hash_code) % self.stripes]:
+            node = self.find_node(key, hash_code)
+            new_value = function(key, None if node is None else node.data.value)
+            if new_value is None:
+                if node is not None:
+                    self.unlink(node, hash_code)
+            elif node is None:
+                self.insert(key, new_value, hash_code)
+            else:
+                node.data.value = new_value
+            return new_value
+
+    def insert(self, key, value, hash_code):
+        """
+        Helper method for adding a new entry at the head of its chain,
+        and rehashing the stripe if its load factor is over MAX_LOAD_FACTOR.
+        Precondition: the lock of the stripe is held and key is not in self.
+        """
+        position, stripe = divmod(abs(hash_code), self.stripes)
+        buckets = self.buckets[stripe]
+        index = position % len(buckets)
+        buckets[index] = HashNode(Entry(key, value), hash_code, buckets[index])
+        self.sizes[stripe] += 1
+        if self.sizes[stripe] / len(buckets) > ConcurrentHashDict.MAX_LOAD_FACTOR:
+            self.rehash(stripe)
+
+    def unlink(self, node, hash_code):
+        """
+        Helper method for removing node from its chain.
+        The removed node keeps its next link, so readers on it can go on.
+        Precondition: the lock of the stripe is held and node is in self.
+        """
+        position, stripe = divmod(abs(hash_code), self.stripes)
+        buckets = self.buckets[stripe]
+        index = position % len(buckets)
+        if buckets[index] is node:
+            buckets[index] = node.next
+        else:
+            prior_node = buckets[index]
+            while prior_node.next is not node:
+                prior_node = prior_node.next
+            prior_node.next = node.next
+        self.sizes[stripe] -= 1
+
+    def rehash(self, stripe):
+        """
+        Doubles the bucket array of one stripe.
+        Copies the nodes (sharing their entries) instead of relinking them,
+        and only then publishes the new array.
+        Precondition: the lock of the stripe is held.
+        """
+        old_buckets = self.buckets[stripe]
+        new_buckets = Array(2 * len(old_buckets))
+        for old_index in range(len(old_buckets)):
+            node = old_buckets[old_index]
             while node is not None:
-                entries.append(node.data)
+                index = abs(node.hash_code) // self.stripes % len(new_buckets)
+                new_buckets[index] = HashNode(node.data, node.hash_code, new_buckets[index])
                 node = node.next
-        # Increase capacity and clear self.
-        self.capacity *= 2
-        self.clear()
-        # Add entries back to self.
-        for entry in entries:
-            self[entry.key] = entry.value
+        self.buckets[stripe] = new_buckets
 
 
 class TreeSortedDict(AbstractDict):
@@ -0,0 +1,73 @@
+class DisjointSet(object):
+    """
+    A disjoint-set (union-find) implementation
+    with path compression and union by rank.
+    """
+
+    # Constructor
+    def __init__(self, source_collection=None):
+        """
+        parents: {item: parent item}
+        ranks: {root item: upper bound of the tree height}
+        """
+        self.parents = dict()
+        self.ranks = dict()
+        if source_collection:
+            for item in source_collection:
+                self.add(item)
+
+    # Accessors
+    def __len__(self):
+        """
+        Returns the number of items in self.
+        """
+        return len(self.parents)
+
+    def __contains__(self, item):
+        return item in self.parents
+
+    def find(self, item):
+        """
+        Returns the representative of the set containing item.
+        Precondition: item is in self.
+        Raises KeyError if item is not in self.
+        """
+        root = item
+        while self.parents[root] != root:
+            root = self.parents[root]
+        # Compress the path so that later finds are faster.
+        while self.parents[item] != root:
+            self.parents[item], item = root, self.parents[item]
+        return root
+
+    def is_connected(self, item1, item2):
+        """
+        Returns True if both items are in the same set, or False otherwise.
+        """
+        return self.find(item1) == self.find(item2)
+
+    # Mutators
+    def add(self, item):
+        """
+        Adds item to self as a singleton set if it's not in self.
+        """
+        if item not in self.parents:
+            self.parents[item] = item
+            self.ranks[item] = 0
+
+    def union(self, item1, item2):
+        """
+        Merges the sets containing both items.
+        Returns True if they were separate sets, or False otherwise.
+        """
+        root1 = self.find(item1)
+        root2 = self.find(item2)
+        if root1 == root2:
+            return False
+        if self.ranks[root1] < self.ranks[root2]:
+            root1, root2 = root2, root1
+        self.parents[root2] = root1
+        if self.ranks[root1] == self.ranks[root2]:
+            self.ranks[root1] += 1
+        del self.ranks[root2]
+        return True
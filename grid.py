@@ -1,25 +1,120 @@
 from arrays import Array
 
 
+class GridLine(object):
+    """
+    A lightweight view of one row or one column of a Grid.
+    Reads and writes go straight to the grid's flat storage.
+    """
+
+    def __init__(self, grid, offset, stride, length):
+        self.grid = grid
+        self.offset = offset
+        self.stride = stride
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        items = self.grid.data.items
+        stop = self.offset + self.stride * self.length
+        return iter(items[self.offset:stop:self.stride])
+
+    def __str__(self):
+        return str(list(self))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[k] for k in range(*index.indices(self.length))]
+        if index < 0 or index >= self.length:
+            raise IndexError(f"Grid line index {index} out of range.")
+        return self.grid.data.items[self.offset + self.stride * index]
+
+    def __setitem__(self, index, new_item):
+        if index < 0 or index >= self.length:
+            raise IndexError(f"Grid line assignment index {index} out of range.")
+        self.grid.data.items[self.offset + self.stride * index] = new_item
+
+
 class Grid(object):
-    def __init__(self, rows, columns, fill_value=None):
-        self.data = Array(rows)
-        for row in range(rows):
-            self.data[row] = Array(columns, fill_value=fill_value)
+    """
+    A two-dimensional grid stored as one flat row-major Array.
+    Supports both grid[r][c] (through a row view) and grid[r, c].
+    """
+
+    def __init__(self, rows, columns, fill_value=None, typecode=None):
+        self.rows = rows
+        self.columns = columns
+        self.data = Array(rows * columns, fill_value=fill_value, typecode=typecode)
 
     def get_height(self):
-        return len(self.data)
+        return self.rows
 
     def get_width(self):
-        return len(self.data[0])
+        return self.columns
+
+    def get_position(self, row, column):
+        """
+        Helper method for finding the flat position of (row, column).
+        """
+        if row < 0 or row >= self.rows or column < 0 or column >= self.columns:
+            raise IndexError(f"Grid index ({row}, {column}) out of range.")
+        return row * self.columns + column
+
+    def row(self, row):
+        """
+        Returns a view of the given row.
+        """
+        if row < 0 or row >= self.rows:
+            raise IndexError(f"Grid row {row} out of range.")
+        return GridLine(self, row * self.columns, 1, self.columns)
+
+    def column(self, column):
+        """
+        Returns a view of the given column.
+        """
+        if column < 0 or column >= self.columns:
+            raise IndexError(f"Grid column {column} out of range.")
+        return GridLine(self, column, self.columns, self.rows)
+
+    def view(self, row=None):
+        """
+        Returns a zero-copy memoryview over the given row, or a
+        two-dimensional (rows x columns) memoryview if row is None.
+        Precondition: self is typed.
+        Raises TypeError if self stores Python objects.
+        """
+        flat = self.data.view()
+        if row is not None:
+            start = self.get_position(row, 0)
+            return flat[start:start + self.columns]
+        if len(flat) == 0:
+            # memoryview cannot be cast to a shape containing zeros
+            return flat
+        return flat.cast("B").cast(self.data.typecode, (self.rows, self.columns))
+
+    def __buffer__(self, flags):
+        """
+        Supports the buffer protocol (Python 3.12+), e.g. numpy.asarray(self).
+        """
+        return self.view()
+
+    def __release_buffer__(self, view):
+        view.release()
 
     def __getitem__(self, index):
-        return self.data[index]
+        if isinstance(index, tuple):
+            return self.data.items[self.get_position(*index)]
+        return self.row(index)
+
+    def __setitem__(self, index, new_item):
+        self.data.items[self.get_position(*index)] = new_item
 
     def __str__(self):
         result = ""
         for row in range(self.get_height()):
             for col in range(self.get_width()):
-                result += str(self.data[row][col]) + " "
+                result += str(self[row, col]) + " "
             result += "\n"
         return result
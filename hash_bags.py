@@ -1,53 +1,53 @@
-from nodes import Node
-from arrays import Array
+from chained_hash_tables import ChainedHashTable
 from abstract_bag import AbstractBag
 from abstract_collection import AbstractCollection
+from open_hash_tables import OpenHashTable
 
 
 class HashBag(AbstractBag):
     """
     A bag implementation based on hashing
-    with bucket/chaining to resolve collisions.
+    with bucket/chaining to resolve collisions (see ChainedHashTable).
+    If incremental is True, rehashing keeps the old and new bucket arrays
+    side by side and every mutation moves a few buckets over,
+    so no single add has to move the whole bag.
+    If power_of_two is True, the capacity is rounded up to a power of two
+    and buckets are picked with a bit mask instead of a modulo.
+    Removing items halves the capacity whenever the load factor drops
+    below low_water (LOW_WATER by default, 0 disables it),
+    but never below the initial capacity.
     """
 
     # Class variables
     DEFAULT_CAPACITY = 29
+    MAX_LOAD_FACTOR = 0.8
+    LOW_WATER = 0.2
 
     # Constructor
-    def __init__(self, source_collection=None, capacity=None):
+    def __init__(self, source_collection=None, capacity=None, incremental=False,
+                 power_of_two=False, low_water=None):
         self.capacity = HashBag.DEFAULT_CAPACITY if capacity is None else capacity
-        self.items = Array(self.capacity)
-        self.found_node = self.prior_node = None
-        self.index = -1
+        self.incremental = incremental
+        self.power_of_two = power_of_two
+        self.low_water = HashBag.LOW_WATER if low_water is None else low_water
+        self.clear()
+        if capacity is None and hasattr(source_collection, "__len__"):
+            self.reserve(len(source_collection))
         AbstractCollection.__init__(self, source_collection)
 
     # Accessor methods
     def __contains__(self, item):
         """
         Returns True if item is in the bag, or False otherwise.
-        Record index, prior_node and found_node during the process
-        for further use.
-        """
-        self.index = abs(hash(item)) % len(self.items)
-        self.prior_node = None
-        self.found_node = self.items[self.index]
-        while self.found_node is not None:
-            if self.found_node.data == item:
-                return True
-            else:
-                self.prior_node = self.found_node
-                self.found_node = self.found_node.next
-        return False
+        The search is recorded in self.table for further use.
+        """
+        return self.table.search(item)
 
     def __iter__(self):
         """
         Supports iteration over a view of self.
         """
-        for index in range(len(self.items)):
-            node = self.items[index]
-            while node is not None:
-                yield node.data
-                node = node.next
+        return iter(self.table)
 
     def __str__(self):
         """
@@ -59,58 +59,118 @@ class HashBag(AbstractBag):
         """
         Returns the load factor of self.
         """
-        return self.size / self.capacity
+        return self.table.load_factor()
+
+    def is_rehashing(self):
+        """
+        Returns True if an incremental rehash is in progress, or False otherwise.
+        """
+        return self.table.is_rehashing()
 
     # Mutator methods
     def clear(self):
         """
         Makes self become empty.
         """
+        self.table = ChainedHashTable(self.capacity, has_values=False,
+                                      max_load_factor=HashBag.MAX_LOAD_FACTOR,
+                                      low_water=self.low_water, incremental=self.incremental,
+                                      power_of_two=self.power_of_two)
         self.size = 0
-        self.found_node = self.prior_node = None
-        self.index = -1
-        self.items = Array(self.capacity)
 
     def add(self, item):
         """
         Add an item to self.
-        Rehash the dict if the load factor is over 0.8.
+        Rehash the bag if the load factor is over MAX_LOAD_FACTOR.
         """
-        self.index = abs(hash(item)) % len(self.items)
-        new_node = Node(item, self.items[self.index])
-        self.items[self.index] = new_node
+        self.table.migrate()
+        self.table.insert(item, hash(item))
         self.size += 1
-        while self.load_factor() > 0.8:
-            self.rehash()
 
     def remove(self, item):
         """
         Precondition: item is in self.
         Remove an item from self.
+        Shrinks the bag if the load factor drops below low_water.
         Raise: KeyError if item is not in self.
         """
+        self.table.migrate()
         if item not in self:
             raise KeyError(f"Item {item} not in the bag.")
-        if self.prior_node is None:
-            self.items[self.index] = None
-        else:
-            self.prior_node.next = self.found_node.next
+        self.table.remove_found()
         self.size -= 1
 
-    def rehash(self):
+    def reserve(self, count):
+        """
+        Makes room for count items in total, so adding them won't rehash.
+        """
+        self.table.reserve(count)
+
+    def compact(self):
         """
-        Increases the capacity by 2 and reload all items.
+        Shrinks the capacity to fit the current size
+        and finishes any incremental rehash in progress.
         """
-        # Extract all items
-        items = []
-        for index in range(len(self.items)):
-            node = self.items[index]
-            while node is not None:
-                items.append(node.data)
-                node = node.next
-        # Increase capacity and clear self.
-        self.capacity *= 2
+        self.table.compact()
+
+
+class OpenHashBag(AbstractBag):
+    """
+    A bag implementation based on hashing
+    with open addressing (see OpenHashTable).
+    Every instance of an item is a separate entry.
+    """
+
+    # Constructor
+    def __init__(self, source_collection=None, capacity=None):
+        self.capacity = OpenHashTable.DEFAULT_CAPACITY if capacity is None else capacity
         self.clear()
-        # Add items back to self.
-        for item in items:
-            self.add(item)
+        AbstractCollection.__init__(self, source_collection)
+
+    # Accessor methods
+    def __contains__(self, item):
+        """
+        Returns True if item is in the bag, or False otherwise.
+        """
+        return self.table.find_slot(item, hash(item))[1] >= 0
+
+    def __iter__(self):
+        """
+        Supports iteration over a view of self.
+        """
+        for position in self.table:
+            yield self.table.keys[position]
+
+    def load_factor(self):
+        """
+        Returns the load factor of self.
+        """
+        return self.table.load_factor()
+
+    # Mutator methods
+    def clear(self):
+        """
+        Makes self become empty.
+        """
+        self.table = OpenHashTable(self.capacity, has_values=False)
+        self.size = 0
+
+    def add(self, item):
+        """
+        Add an item to self.
+        """
+        hash_code = hash(item)
+        self.table.insert(self.table.find_free_slot(hash_code), item, None, hash_code)
+        self.size += 1
+
+    def remove(self, item):
+        """
+        Precondition: item is in self.
+        Remove an item from self.
+        Raise: KeyError if item is not in self.
+        """
+        slot, position = self.table.find_slot(item, hash(item))
+        if position < 0:
+            raise KeyError(f"Item {item} not in the bag.")
+        self.table.delete(slot, position)
+        self.size -= 1
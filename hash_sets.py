@@ -1,7 +1,5 @@
-from nodes import Node
-from arrays import Array
 from abstract_set import AbstractSet
-from hash_bags import HashBag
+from hash_bags import HashBag, OpenHashBag
 
 
 class HashSet(AbstractSet, HashBag):
@@ -13,32 +11,66 @@ class HashSet(AbstractSet, HashBag):
     """
 
     # Constructor
-    def __init__(self, source_collection=None, capacity=None):
-        HashBag.__init__(self, source_collection)
+    def __init__(self, source_collection=None, capacity=None, incremental=False,
+                 power_of_two=False, low_water=None):
+        HashBag.__init__(self, source_collection, capacity, incremental, power_of_two, low_water)
 
     # Mutator methods
     def add(self, item):
         """
         Add an item to self.
-        Rehash the dict if the load factor is over 0.8.
+        Rehash the set if the load factor is over MAX_LOAD_FACTOR.
         """
+        self.table.migrate()
         if item not in self:
-            new_node = Node(item, self.items[self.index])
-            self.items[self.index] = new_node
+            self.table.insert_found(item)
             self.size += 1
-        while self.load_factor() > 0.8:
-            self.rehash()
 
     def remove(self, item):
         """
         Precondition: item is in self.
         Remove an item from self.
+        Shrinks the set if the load factor drops below low_water.
         Raise: KeyError if item is not in self.
         """
+        self.table.migrate()
         if item not in self:
             raise KeyError(f"Item {item} not in the set.")
-        if self.prior_node is None:
-            self.items[self.index] = None
-        else:
-            self.prior_node.next = self.found_node.next
+        self.table.remove_found()
+        self.size -= 1
+
+
+class OpenHashSet(AbstractSet, OpenHashBag):
+    """
+    A set implementation based on hashing
+    with open addressing (see OpenHashTable).
+    Inherent most methods from OpenHashBag.
+    Inherent set-specific methods from AbstractSet.
+    """
+
+    # Constructor
+    def __init__(self, source_collection=None, capacity=None):
+        OpenHashBag.__init__(self, source_collection, capacity)
+
+    # Mutator methods
+    def add(self, item):
+        """
+        Add an item to self if it's not in self.
+        """
+        hash_code = hash(item)
+        slot, position = self.table.find_slot(item, hash_code)
+        if position < 0:
+            self.table.insert(slot, item, None, hash_code)
+            self.size += 1
+
+    def remove(self, item):
+        """
+        Precondition: item is in self.
+        Remove an item from self.
+        Raise: KeyError if item is not in self.
+        """
+        slot, position = self.table.find_slot(item, hash(item))
+        if position < 0:
+            raise KeyError(f"Item {item} not in the set.")
+        self.table.delete(slot, position)
         self.size -= 1
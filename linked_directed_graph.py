@@ -1,11 +1,31 @@
+import csv
+import json
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 from abstract_collection import AbstractCollection
-from arrays import Array
+from csr_graphs import CSRGraph, init_worker, worker_shortest_paths
+from disjoint_sets import DisjointSet
 from grid import Grid
+from reachability_indexes import ReachabilityIndex
 from stacks import LinkedStack
-from queues import LinkedQueue
+from topological_orders import DynamicTopologicalOrder
+from queues import LinkedQueue, HeapPriorityQueue
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 INF = "-"
 
+# Header of the binary graph format:
+# magic, weight typecode (b" " if unweighted), vertex count, edge count, label bytes.
+BINARY_MAGIC = b"LDG1"
+BINARY_HEADER = struct.Struct("<4scqqq")
+
 
 def add_with_inf(a, b):
     return INF if (a == INF or b == INF) else a + b
@@ -32,11 +52,14 @@ def min_with_inf(a, b):
 class LinkedVertex(object):
     """
     Represents the vertex in LinkedDirectedGraph.
+    edge_table: {neighbor label: edge object}, kept in insertion order.
+    in_edge_table: {predecessor label: edge object} for edges coming into self.
     """
 
     def __init__(self, label):
         self.label = label
-        self.edge_list = list()
+        self.edge_table = dict()
+        self.in_edge_table = dict()
         self.mark = False
 
     def __str__(self):
@@ -71,9 +94,25 @@ class LinkedVertex(object):
         """
         Sets the vertex's label to g's label.
         """
-        g.vertices.pop(self.label, None)
+        old_label = self.label
+        g.vertices.pop(old_label, None)
         g.vertices[label] = self
         self.label = label
+        if g.reachability_index is not None:
+            g.reachability_index.invalidate()
+        if g.topological_order is not None:
+            g.topological_order.on_set_label(old_label, label)
+        # Re-key the edges on both ends.
+        for edge in list(self.in_edge_table.values()):
+            from_table = edge.get_from_vertex().edge_table
+            from_table.pop(old_label)
+            from_table[label] = edge
+            edge.update_hash()
+        for edge in list(self.edge_table.values()):
+            to_table = edge.get_to_vertex().in_edge_table
+            to_table.pop(old_label)
+            to_table[label] = edge
+            edge.update_hash()
 
     def add_edge_to(self, to_vertex, weight):
         """
@@ -81,39 +120,55 @@ class LinkedVertex(object):
         """
         if self.has_edge_to(to_vertex):
             raise AttributeError(f"Edge to {to_vertex} already exists.")
+        self.link_edge_to(to_vertex, weight)
+
+    def link_edge_to(self, to_vertex, weight):
+        """
+        Adds an edge to the to_vertex without checking for an existing one.
+        Precondition: There's no edge to the to_vertex yet.
+        """
         edge = LinkedEdge(self, to_vertex, weight)
-        self.edge_list.append(edge)
+        self.edge_table[to_vertex.get_label()] = edge
+        to_vertex.in_edge_table[self.label] = edge
 
     def has_edge_to(self, to_vertex):
         """
         Returns True if the edge to the to_vertex exists, or False otherwise.
         """
-        return bool(self.get_edge_to(to_vertex))
+        return to_vertex.get_label() in self.edge_table
 
     def get_edge_to(self, to_vertex):
         """
         Returns the edge object to the to_vertex if exists, or False otherwise.
         """
-        for edge in self.edge_list:
-            if to_vertex == edge.get_other_vertex(self):
-                return edge
-        return False
+        return self.edge_table.get(to_vertex.get_label(), False)
 
     def remove_edge_to(self, to_vertex):
         """
         Returns True is the edge is removed successfully, or False otherwise.
         """
-        for edge in self.edge_list:
-            if edge.get_other_vertex(self) == to_vertex:
-                self.edge_list.remove(edge)
-                return True
-        return False
+        if self.edge_table.pop(to_vertex.get_label(), None) is None:
+            return False
+        to_vertex.in_edge_table.pop(self.label, None)
+        return True
 
     def incident_edges(self):
         """
         Returns an iterator of all edges coming out of self.
         """
-        return iter(self.edge_list)
+        return iter(self.edge_table.values())
+
+    def incoming_edges(self):
+        """
+        Returns an iterator of all edges coming into self.
+        """
+        return iter(self.in_edge_table.values())
+
+    def predecessor_vertices(self):
+        """
+        Returns an iterator of all vertices with an edge into self.
+        """
+        return map(lambda edge: edge.get_from_vertex(), self.incoming_edges())
 
     def neighboring_vertices(self):
         """
@@ -128,6 +183,7 @@ class LinkedVertex(object):
 class LinkedEdge(object):
     """
     Represents the edge in LinkedDirectedGraph.
+    The hash only depends on the two end labels, and is computed once.
     """
 
     def __init__(self, from_vertex, to_vertex, weight=None):
@@ -135,17 +191,18 @@ class LinkedEdge(object):
         self.to_vertex = to_vertex
         self.weight = weight
         self.mark = False
+        self.update_hash()
 
     def __eq__(self, other):
         if self is other:
             return True
         elif type(self) != type(other):
             return False
-        return all([
-            self.from_vertex == other.from_vertex,
-            self.to_vertex == other.to_vertex,
-            self.weight == other.weight
-        ])
+        return (
+            self.from_vertex == other.from_vertex
+            and self.to_vertex == other.to_vertex
+            and self.weight == other.weight
+        )
 
     def __str__(self):
         return f"{self.from_vertex}>{self.to_vertex}:{self.weight}"
@@ -154,7 +211,13 @@ class LinkedEdge(object):
         return f"Edge({str(self)})"
 
     def __hash__(self):
-        return hash(str(self))
+        return self.hash_code
+
+    def update_hash(self):
+        """
+        Recomputes the cached hash after an end vertex is relabeled.
+        """
+        self.hash_code = hash((self.from_vertex.get_label(), self.to_vertex.get_label()))
 
     def clear_mark(self):
         self.mark = False
@@ -181,6 +244,42 @@ class LinkedEdge(object):
         return self.to_vertex
 
 
+class EdgeView(object):
+    """
+    A live, read-only view of the edges in a LinkedDirectedGraph.
+    Supports len, in (for edges or (from label, to label) pairs)
+    and iteration without copying the edges anywhere.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __len__(self):
+        return self.graph.size_edges()
+
+    def __iter__(self):
+        """
+        Visits the edges vertex by vertex, in insertion order.
+        """
+        for vertex in self.graph:
+            for edge in vertex.incident_edges():
+                yield edge
+
+    def __contains__(self, edge):
+        if not isinstance(edge, LinkedEdge):
+            from_label, to_label = edge
+            from_vertex = self.graph.vertices.get(from_label, None)
+            return from_vertex is not None and to_label in from_vertex.edge_table
+        from_vertex = self.graph.vertices.get(edge.get_from_vertex().get_label(), None)
+        if from_vertex is None:
+            return False
+        found_edge = from_vertex.edge_table.get(edge.get_to_vertex().get_label(), None)
+        return found_edge is not None and found_edge == edge
+
+    def __str__(self):
+        return "{" + ", ".join(map(str, self)) + "}"
+
+
 class LinkedDirectedGraph(AbstractCollection):
     """
     A weighted directed graph implementation
@@ -193,11 +292,89 @@ class LinkedDirectedGraph(AbstractCollection):
         size attribute counts the number of vertices.
         edge_count attribute counts the number of edges.
         vertices: {vertex name: vertex object}
+        reachability_index: an optional ReachabilityIndex kept up to date
+        topological_order: an optional DynamicTopologicalOrder kept up to date
         """
         self.edge_count = 0
         self.vertices = dict()
+        self.reachability_index = None
+        self.topological_order = None
         AbstractCollection.__init__(self, source_collection)
 
+    @classmethod
+    def from_edges(cls, edges, weighted=True, trusted=False):
+        """
+        Returns a new graph built from an iterable of
+        (from label, to label, weight) triples, or (from label, to label)
+        pairs if weighted is False. Vertices are added as they appear.
+        If trusted is True, the input must not contain duplicate edges,
+        and the per-edge duplicate checks are skipped.
+        """
+        graph = cls()
+        graph.add_edges(edges, weighted=weighted, trusted=trusted)
+        return graph
+
+    @classmethod
+    def load_edge_list(cls, path, delimiter=None, weighted=True, trusted=False,
+                       label_type=str, weight_type=float):
+        """
+        Returns a new graph read line by line from a CSV/TSV edge list.
+        Each row is "from, to[, weight]"; blank rows and rows starting
+        with "#" are skipped. The delimiter defaults to a tab for .tsv files
+        and a comma otherwise. Labels and weights are converted with
+        label_type and weight_type.
+        """
+        if delimiter is None:
+            delimiter = "\t" if path.endswith(".tsv") else ","
+
+        def read_edges(lines):
+            for row in csv.reader(lines, delimiter=delimiter):
+                if not row or row[0].startswith("#"):
+                    continue
+                from_label, to_label = label_type(row[0]), label_type(row[1])
+                if weighted:
+                    yield from_label, to_label, weight_type(row[2])
+                else:
+                    yield from_label, to_label
+
+        with open(path, newline="") as lines:
+            return cls.from_edges(read_edges(lines), weighted=weighted, trusted=trusted)
+
+    @classmethod
+    def load_binary(cls, path):
+        """
+        Returns a new graph read from a file written by save_binary.
+        Raises ValueError if the file is not in the binary graph format.
+        """
+        with open(path, "rb") as stream:
+            header = stream.read(BINARY_HEADER.size)
+            if len(header) != BINARY_HEADER.size:
+                raise ValueError(f"{path} is not a binary graph file.")
+            magic, typecode, vertex_count, edge_count, label_size = BINARY_HEADER.unpack(header)
+            if magic != BINARY_MAGIC:
+                raise ValueError(f"{path} is not a binary graph file.")
+            labels = json.loads(stream.read(label_size).decode("utf-8"))
+            offsets = array("q")
+            offsets.fromfile(stream, vertex_count + 1)
+            targets = array("q")
+            targets.fromfile(stream, edge_count)
+            weights = None
+            if typecode != b" ":
+                weights = array(typecode.decode("ascii"))
+                weights.fromfile(stream, edge_count)
+            if sys.byteorder != "little":
+                for items in (offsets, targets, weights):
+                    if items is not None:
+                        items.byteswap()
+        graph = cls(labels)
+        vertex_list = list(graph)
+        for k, from_vertex in enumerate(vertex_list):
+            for position in range(offsets[k], offsets[k + 1]):
+                weight = None if weights is None else weights[position]
+                from_vertex.link_edge_to(vertex_list[targets[position]], weight)
+        graph.edge_count = edge_count
+        return graph
+
     # Accessors
     def __str__(self):
         """
@@ -221,13 +398,10 @@ class LinkedDirectedGraph(AbstractCollection):
 
     def edges(self):
         """
-        Supports iteration over the edges in the graph.
+        Returns an EdgeView over the edges in the graph.
+        The view is lazy and always reflects the current edges.
         """
-        result = set()
-        for vertex in self.get_vertices():
-            edges = vertex.incident_edges()
-            result = result.union(set(edges))
-        return iter(result)
+        return EdgeView(self)
 
     def size_vertices(self):
         """
@@ -283,6 +457,70 @@ class LinkedDirectedGraph(AbstractCollection):
         vertex = self.get_vertex(label)
         return vertex.neighboring_vertices() if vertex is not None else None
 
+    def in_edges(self, label):
+        """
+        Returns an iterator of all edges coming into the vertex with the label.
+        Precondition: The label is in self.
+        Raises AttributeError if the label is not in self.
+        """
+        return self.get_vertex(label).incoming_edges()
+
+    def predecessors(self, label):
+        """
+        Returns an iterator of all vertices with an edge into the vertex with the label.
+        Precondition: The label is in self.
+        Raises AttributeError if the label is not in self.
+        """
+        return self.get_vertex(label).predecessor_vertices()
+
+    def save_binary(self, path):
+        """
+        Writes self to path in a compact binary format:
+        a header, the labels as JSON, then the CSR offset, target
+        and weight arrays as little-endian machine words.
+        Precondition: labels are JSON scalars and weights are all numbers
+        or all None.
+        Raises ValueError if the labels or the weights can't be stored.
+        """
+        csr = self.to_csr()
+        for label in csr.labels:
+            if label is not None and type(label) not in (str, int, float, bool):
+                raise ValueError(f"Label {label!r} can't be saved in binary.")
+        weights = csr.weights
+        if weights.is_typed():
+            typecode = weights.typecode.encode("ascii")
+        elif all(weight is None for weight in weights.items):
+            typecode = b" "
+        else:
+            raise ValueError("Only numeric or missing weights can be saved in binary.")
+        label_bytes = json.dumps(csr.labels).encode("utf-8")
+        with open(path, "wb") as stream:
+            stream.write(BINARY_HEADER.pack(
+                BINARY_MAGIC, typecode, len(csr), csr.size_edges(), len(label_bytes)
+            ))
+            stream.write(label_bytes)
+            words = [csr.offsets.items, csr.targets.items]
+            if typecode != b" ":
+                words.append(weights.items)
+            for items in words:
+                if sys.byteorder != "little":
+                    items = array(items.typecode, items)
+                    items.byteswap()
+                items.tofile(stream)
+
+    def to_csr(self):
+        """
+        Returns an immutable CSRGraph snapshot of self
+        for fast read-only traversals.
+        """
+        return CSRGraph(self)
+
+    def freeze(self):
+        """
+        Same as self.to_csr().
+        """
+        return self.to_csr()
+
     def get_label_table(self):
         """
         Returns a dictionary with labels as keys and numbers as values.
@@ -292,26 +530,131 @@ class LinkedDirectedGraph(AbstractCollection):
             label_table[v.get_label()] = k
         return label_table
 
-    def topological_sort(self):
+    def topological_sort(self, strict=False):
         """
         Returns a list of vertices after topological sorting.
-        """
-        # Helper function
-        def dfs(v, stack):
-            v.set_mark()
-            for w in self.neighboring_vertices(v.get_label()):
-                if not w.is_marked():
-                    dfs(w, stack)
-            stack.push(v)
+        Uses an explicit stack, so long paths don't hit the recursion limit.
+        The order is meaningless if self has a cycle: with strict=True,
+        raises ValueError instead (see also has_cycle and condensation).
+        """
+        visited = set()
+        # Vertices on the current DFS path; an edge back into it closes a cycle.
+        on_path = set()
+        finished = []
+        for root in self.get_vertices():
+            if root in visited:
+                continue
+            visited.add(root)
+            on_path.add(root)
+            # Each stack entry is (vertex, iterator over its remaining edges).
+            stack = LinkedStack()
+            stack.push((root, root.incident_edges()))
+            while not stack.is_empty():
+                v, edges = stack.peek()
+                for edge in edges:
+                    w = edge.get_to_vertex()
+                    if strict and w in on_path:
+                        raise ValueError(f"The graph has a cycle through {w}.")
+                    if w not in visited:
+                        visited.add(w)
+                        on_path.add(w)
+                        stack.push((w, w.incident_edges()))
+                        break
+                else:
+                    stack.pop()
+                    on_path.discard(v)
+                    finished.append(v)
+        finished.reverse()
+        return finished
+
+    def strongly_connected_components(self):
+        """
+        Returns a list of strongly connected components (lists of vertices),
+        in topological order of the condensation.
+        Uses Tarjan algorithm with an explicit stack.
+        """
+        index = dict()
+        low = dict()
+        component_stack = []
+        on_stack = set()
+        components = []
+        for root in self.get_vertices():
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            component_stack.append(root)
+            on_stack.add(root)
+            # Each stack entry is (vertex, iterator over its remaining edges).
+            stack = LinkedStack()
+            stack.push((root, root.incident_edges()))
+            while not stack.is_empty():
+                v, edges = stack.peek()
+                for edge in edges:
+                    w = edge.get_to_vertex()
+                    if w not in index:
+                        index[w] = low[w] = len(index)
+                        component_stack.append(w)
+                        on_stack.add(w)
+                        stack.push((w, w.incident_edges()))
+                        break
+                    elif w in on_stack:
+                        low[v] = min(low[v], index[w])
+                else:
+                    stack.pop()
+                    if not stack.is_empty():
+                        parent = stack.peek()[0]
+                        low[parent] = min(low[parent], low[v])
+                    if low[v] == index[v]:
+                        component = []
+                        while True:
+                            w = component_stack.pop()
+                            on_stack.remove(w)
+                            component.append(w)
+                            if w is v:
+                                break
+                        components.append(component)
+        # Tarjan finds the sink components first.
+        components.reverse()
+        return components
+
+    def has_cycle(self):
+        """
+        Returns True if self has a directed cycle, or False otherwise.
+        """
+        try:
+            self.topological_sort(strict=True)
+        except ValueError:
+            return True
+        return False
 
-        stack = LinkedStack()
-        self.clear_vertex_marks()
-        for v in self.get_vertices():
-            if not v.is_marked():
-                dfs(v, stack)
-        result = []
-        while not stack.is_empty():
-            result.append(stack.pop())
+    def condensation(self):
+        """
+        Returns a new LinkedDirectedGraph with one vertex per strongly
+        connected component. Each label is a tuple of the component's labels.
+        Vertices are added in topological order, so the result is acyclic.
+        An edge between two components gets the smallest weight
+        among the edges it replaces.
+        """
+        components = self.strongly_connected_components()
+        result = LinkedDirectedGraph()
+        component_labels = dict()
+        for component in components:
+            label = tuple(vertex.get_label() for vertex in component)
+            result.add_vertex(label)
+            for vertex in component:
+                component_labels[vertex] = label
+        for vertex in self:
+            from_label = component_labels[vertex]
+            for edge in vertex.incident_edges():
+                to_label = component_labels[edge.get_to_vertex()]
+                if from_label == to_label:
+                    continue
+                weight = edge.get_weight()
+                old_edge = result.get_edge(from_label, to_label)
+                if not old_edge:
+                    result.add_edge(from_label, to_label, weight)
+                elif weight is not None and old_edge.get_weight() is not None:
+                    old_edge.set_weight(min_with_inf(old_edge.get_weight(), weight))
         return result
 
     def depth_first(self, start_label):
@@ -319,177 +662,342 @@ class LinkedDirectedGraph(AbstractCollection):
         Traverse the graph from the starting vertex using DFS.
         Returns a list of vertices.
         """
-        # Helper function
-        def recurse(stack, result):
-            if stack.is_empty():
-                return
-            v = stack.peek()
-            for w in v.neighboring_vertices():
-                if not w.is_marked():
-                    w.set_mark()
-                    stack.push(w)
-                    result.append(w)
-                    recurse(stack, result)
-            stack.pop()
+        return list(self.iter_depth_first(start_label))
 
+    def iter_depth_first(self, start_label):
+        """
+        Traverse the graph from the starting vertex using DFS.
+        Yields the vertices lazily, so the caller can stop early.
+        Uses an explicit stack, so long paths don't hit the recursion limit.
+        """
+        start_vertex = self.get_vertex(start_label)
+        visited = set([start_vertex])
+        yield start_vertex
+        # The stack holds iterators over the remaining edges of each vertex.
         stack = LinkedStack()
-        self.clear_vertex_marks()
-        v = self.get_vertex(start_label)
-        v.set_mark()
-        stack.add(v)
-        result = [v]
-        recurse(stack, result)
-        return result
+        stack.push(start_vertex.incident_edges())
+        while not stack.is_empty():
+            for edge in stack.peek():
+                w = edge.get_to_vertex()
+                if w not in visited:
+                    visited.add(w)
+                    yield w
+                    stack.push(w.incident_edges())
+                    break
+            else:
+                stack.pop()
 
     def breadth_first(self, start_label):
         """
         Traverse the graph from the starting vertex using BFS.
         Returns a list of vertices.
         """
-        self.clear_vertex_marks()
+        return list(self.iter_breadth_first(start_label))
+
+    def iter_breadth_first(self, start_label):
+        """
+        Traverse the graph from the starting vertex using BFS.
+        Yields the vertices lazily, so the caller can stop early.
+        """
         queue = LinkedQueue()
         # Initialize
         start_vertex = self.get_vertex(start_label)
-        start_vertex.set_mark()
-        result = [start_vertex]
+        visited = set([start_vertex])
+        yield start_vertex
         queue.add(start_vertex)
         while not queue.is_empty():
             # Get the front vertex and its edge to other vertices
-            # Add all non-marking vertices to the queue.
+            # Add all non-visited vertices to the queue.
             v = queue.pop()
             for edge in v.incident_edges():
                 to_vertex = edge.get_to_vertex()
-                if not to_vertex.is_marked():
-                    result.append(to_vertex)
+                if to_vertex not in visited:
+                    visited.add(to_vertex)
+                    yield to_vertex
                     queue.add(to_vertex)
-                    to_vertex.set_mark()
-        return result
 
-    def span_tree(self, start_label):
+    def span_tree(self, start_label, set_marks=True):
         """
         Returns the minimal spanning tree using Prim algorithm.
-        """
-        # Helper function
-        def find_minimal_weight_edge(visited_edges, visited, not_visited):
-            minimal_edge = None
-            minimal_weight = INF
-            for edge in self.edges():
-                if all([
-                    edge not in visited_edges,
-                    edge.get_from_vertex() in visited,
-                    edge.get_to_vertex() in not_visited,
-                ]):
-                    weight = edge.get_weight()
-                    if is_less_with_inf(weight, minimal_weight):
-                        minimal_edge = edge
-                        minimal_weight = weight
-            return minimal_edge
-        # Clear all marks for both vertices and edges.
-        self.clear_vertex_marks()
-        self.clear_edge_marks()
-        # Mark the starting vertex as visited.
-        start_vertex = self.get_vertex(start_label)
-        start_vertex.set_mark()
-        # Starting the algorithm
-        visited = set([start_vertex])
-        not_visited = set(self) - visited
-        tree_edges = set()
-        for vertex in self:
-            min_weight_edge = find_minimal_weight_edge(tree_edges, visited, not_visited)
-            if min_weight_edge is None:
-                return list(tree_edges)
-            else:
-                w = min_weight_edge.get_to_vertex()
-                min_weight_edge.set_mark()
-                w.set_mark()
-                visited.add(w)
-                not_visited.remove(w)
-                tree_edges.add(min_weight_edge)
-
-    def shortest_paths(self, start_label):
+        Candidate edges are kept in a heap, so it runs in O(E log V).
+        If set_marks is True, marks the tree's vertices and edges
+        (after clearing all marks); pass False to leave the graph untouched.
+        """
+        visited = set()
+        # The counter breaks ties so that edges never get compared.
+        counter = 0
+        queue = HeapPriorityQueue()
+        tree_edges = []
+        vertex = self.get_vertex(start_label)
+        while True:
+            # Add the new vertex to visited and add its outgoing edges.
+            visited.add(vertex)
+            for edge in vertex.incident_edges():
+                weight = edge.get_weight()
+                if weight != INF and edge.get_to_vertex() not in visited:
+                    counter += 1
+                    queue.add((weight, counter, edge))
+            # Find the minimal edge leading out of the visited vertices.
+            vertex = None
+            while not queue.is_empty():
+                edge = queue.pop()[2]
+                if edge.get_to_vertex() not in visited:
+                    vertex = edge.get_to_vertex()
+                    break
+            if vertex is None:
+                break
+            tree_edges.append(edge)
+        if set_marks:
+            self.set_marks(visited, tree_edges)
+        return tree_edges
+
+    def span_forest(self, set_marks=True):
+        """
+        Returns the minimal spanning forest using Kruskal algorithm,
+        treating every edge as undirected.
+        If set_marks is True, marks the edges in the forest and
+        the vertices they connect (after clearing all marks).
+        """
+        components = DisjointSet(self)
+        candidates = [edge for edge in self.edges() if edge.get_weight() != INF]
+        candidates.sort(key=lambda edge: edge.get_weight())
+        forest_edges = []
+        for edge in candidates:
+            from_vertex = edge.get_from_vertex()
+            to_vertex = edge.get_to_vertex()
+            if components.union(from_vertex, to_vertex):
+                forest_edges.append(edge)
+                if len(forest_edges) == len(self) - 1:
+                    break
+        if set_marks:
+            connected = set()
+            for edge in forest_edges:
+                connected.add(edge.get_from_vertex())
+                connected.add(edge.get_to_vertex())
+            self.set_marks(connected, forest_edges)
+        return forest_edges
+
+    def shortest_paths(self, start_label, target_label=None):
         """
         Returns the shortest paths from starting vertex using Dijkstra algorithm.
+        Each row of the result grid holds a label, its distance and
+        the label of its predecessor.
+        If target_label is given, stops as soon as the target is settled;
+        vertices not settled by then are reported as unreachable.
         """
-        included = Array(len(self))
         result = Grid(len(self), 3)
-        start_vertex = self.get_vertex(start_label)
-        # Initializing
-        num = 0
-        for vertex in self:
-            result[num][0] = vertex.get_label()
-            if vertex == start_vertex:
-                # If it's the starting vertex
-                result[num][1] = 0
-                result[num][2] = None
-                included[num] = True
-            elif start_vertex.has_edge_to(vertex):
-                # If it's connecting to the starting vertex
-                result[num][1] = start_vertex.get_edge_to(vertex).get_weight()
-                result[num][2] = start_vertex
-                included[num] = False
-            else:
-                # Other vertices
-                result[num][1] = INF
-                result[num][2] = None
-                included[num] = False
-            num += 1
-        # Computing
-        while True:
-            # Find the vertex that hasn't been included and
-            # has the minimal distance in the result grid.
-            # Break if all vertices have been included.
-            min_num = None
-            min_dist = INF
-            for num in range(len(self)):
-                dist = result[num][1]
-                if not included[num] and is_less_with_inf(dist, min_dist):
-                    min_num = num
-                    min_dist = dist
-            if min_num is None:
+        label_table = self.get_label_table()
+        for label, row in label_table.items():
+            result[row, 0] = label
+            result[row, 1] = INF
+            result[row, 2] = None
+        for label, dist, pred_label in self.iter_shortest_paths(start_label):
+            row = label_table[label]
+            result[row, 1] = dist
+            result[row, 2] = pred_label
+            if label == target_label:
                 break
-            # Mark this vertex as visited
-            included[min_num] = True
-            for other_num in range(len(self)):
-                this_label = result[min_num][0]
-                other_label = result[other_num][0]
-                edge = self.get_edge(this_label, other_label)
-                if not included[other_num] and edge:
-                    new_dist = add_with_inf(edge.get_weight(), result[min_num][1])
-                    if is_less_with_inf(new_dist, result[other_num][1]):
-                        result[other_num][1] = new_dist
-                        result[other_num][2] = this_label
         return result
 
+    def shortest_paths_many(self, start_labels, workers=None):
+        """
+        Computes shortest_paths for many starting vertices in parallel.
+        Yields (start label, result grid) pairs as soon as each one finishes,
+        so the order may differ from start_labels.
+        The workers share one read-only CSR snapshot of self, which is sent
+        to each worker process once. workers defaults to the CPU count;
+        with workers=1 everything runs in this process.
+        """
+        start_labels = list(start_labels)
+        snapshot = self.to_csr()
+        for start_label in start_labels:
+            # Fail early, before any process is started.
+            snapshot.get_id(start_label)
+        return self.iter_shortest_paths_many(snapshot, start_labels, workers)
+
+    @staticmethod
+    def iter_shortest_paths_many(snapshot, start_labels, workers):
+        """
+        Helper method for yielding the results of shortest_paths_many.
+        Stopping early cancels the tasks that haven't started yet,
+        without waiting for the running ones.
+        """
+        if workers == 1:
+            for start_label in start_labels:
+                yield start_label, snapshot.shortest_paths(start_label)
+            return
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                       initargs=(snapshot,))
+        try:
+            futures = [executor.submit(worker_shortest_paths, label) for label in start_labels]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_shortest_paths(self, start_label):
+        """
+        Runs Dijkstra algorithm from the starting vertex with a binary heap.
+        Yields (label, distance, predecessor label) for every reachable vertex
+        in the order the vertices are settled.
+        Outdated heap entries are skipped when popped (lazy deletion).
+        """
+        start_vertex = self.get_vertex(start_label)
+        dist = {start_vertex: 0}
+        pred = {start_vertex: None}
+        settled = set()
+        # The counter breaks ties so that vertices never get compared.
+        counter = 0
+        queue = HeapPriorityQueue()
+        queue.add((0, counter, start_vertex))
+        while not queue.is_empty():
+            this_dist, _, vertex = queue.pop()
+            if vertex in settled:
+                continue
+            settled.add(vertex)
+            yield vertex.get_label(), this_dist, pred[vertex]
+            for edge in vertex.incident_edges():
+                other = edge.get_to_vertex()
+                if other in settled:
+                    continue
+                new_dist = this_dist + edge.get_weight()
+                if other not in dist or new_dist < dist[other]:
+                    dist[other] = new_dist
+                    pred[other] = vertex.get_label()
+                    counter += 1
+                    queue.add((new_dist, counter, other))
+
+    def shortest_path(self, start_label, goal_label):
+        """
+        Returns (list of labels on the shortest path, its cost)
+        from the starting vertex to the goal, or (None, INF) if there's no path.
+        Stops as soon as the goal is settled.
+        """
+        return self.a_star(start_label, goal_label)
+
+    def a_star(self, start_label, goal_label, heuristic=None):
+        """
+        Returns (list of labels on the shortest path, its cost)
+        from the starting vertex to the goal using A* search,
+        or (None, INF) if there's no path.
+        heuristic(label) estimates the remaining cost to the goal; it must
+        never overestimate it. Without a heuristic, this is Dijkstra
+        algorithm with early exit.
+        """
+        start_vertex = self.get_vertex(start_label)
+        goal_vertex = self.get_vertex(goal_label)
+        if heuristic is None:
+            def heuristic(label):
+                return 0
+        dist = {start_vertex: 0}
+        pred = {start_vertex: None}
+        # Entries are (estimated total, counter, distance, vertex).
+        # The counter breaks ties so that vertices never get compared.
+        counter = 0
+        queue = HeapPriorityQueue()
+        queue.add((heuristic(start_label), counter, 0, start_vertex))
+        while not queue.is_empty():
+            _, _, this_dist, vertex = queue.pop()
+            if this_dist > dist[vertex]:
+                # Outdated entry: a shorter way to vertex was found later.
+                continue
+            if vertex is goal_vertex:
+                path = []
+                while vertex is not None:
+                    path.append(vertex.get_label())
+                    vertex = pred[vertex]
+                path.reverse()
+                return path, this_dist
+            for edge in vertex.incident_edges():
+                other = edge.get_to_vertex()
+                new_dist = this_dist + edge.get_weight()
+                if other not in dist or new_dist < dist[other]:
+                    dist[other] = new_dist
+                    pred[other] = vertex
+                    counter += 1
+                    queue.add((new_dist + heuristic(other.get_label()), counter, new_dist, other))
+        return None, INF
+
     def has_path(self, start_label, to_label):
         """
         Returns True if there's a path between two vertices, or False otherwise.
+        Uses the reachability index if one has been built. Otherwise
+        runs a bidirectional BFS: outgoing edges from the start,
+        incoming edges into the target, always expanding the smaller frontier.
         """
         if not all([self.contains_vertex(start_label), self.contains_vertex(to_label)]):
             return False
-        # Using BFS to search possible routes
-        # Break if encounters the target during the search
-        self.clear_vertex_marks()
-        queue = LinkedQueue()
+        if self.reachability_index is not None:
+            return self.reachability_index.has_path(start_label, to_label)
         start_vertex = self.get_vertex(start_label)
         target_vertex = self.get_vertex(to_label)
-        start_vertex.set_mark()
-        result = [start_vertex]
-        queue.add(start_vertex)
+        # The forward side starts one step away from the start,
+        # so that a path always has at least one edge.
+        forward_visited = set(start_vertex.neighboring_vertices())
+        if target_vertex in forward_visited:
+            return True
+        backward_visited = set([target_vertex])
+        forward_frontier = list(forward_visited)
+        backward_frontier = [target_vertex]
+        while forward_frontier and backward_frontier:
+            next_frontier = []
+            if len(forward_frontier) <= len(backward_frontier):
+                for v in forward_frontier:
+                    for w in v.neighboring_vertices():
+                        if w in backward_visited:
+                            return True
+                        if w not in forward_visited:
+                            forward_visited.add(w)
+                            next_frontier.append(w)
+                forward_frontier = next_frontier
+            else:
+                for v in backward_frontier:
+                    for w in v.predecessor_vertices():
+                        if w in forward_visited:
+                            return True
+                        if w not in backward_visited:
+                            backward_visited.add(w)
+                            next_frontier.append(w)
+                backward_frontier = next_frontier
+        return False
+
+    def has_paths(self, pairs):
+        """
+        Returns a list of has_path results for an iterable of
+        (start label, to label) pairs, in the same order.
+        Pairs sharing a start label share a single BFS, which stops
+        as soon as all of their targets have been reached.
+        """
+        pairs = list(pairs)
+        results = [False] * len(pairs)
+        # pending: {start label: {to label: [positions in pairs]}}
+        pending = dict()
+        for k, (start_label, to_label) in enumerate(pairs):
+            if self.contains_vertex(start_label) and self.contains_vertex(to_label):
+                pending.setdefault(start_label, dict()).setdefault(to_label, []).append(k)
+        for start_label, targets in pending.items():
+            for vertex in self.iter_reachable(start_label):
+                for k in targets.pop(vertex.get_label(), []):
+                    results[k] = True
+                if not targets:
+                    break
+        return results
+
+    def iter_reachable(self, start_label):
+        """
+        Yields every vertex reachable from the starting vertex
+        through at least one edge, in BFS order.
+        """
+        queue = LinkedQueue()
+        queue.add(self.get_vertex(start_label))
+        visited = set()
         while not queue.is_empty():
-            # Get the front vertex and its edge to other vertices
-            # Add all non-marking vertices to the queue.
             v = queue.pop()
-            for edge in v.incident_edges():
-                to_vertex = edge.get_to_vertex()
-                if to_vertex == target_vertex:
-                    return True
-                if not to_vertex.is_marked():
-                    result.append(to_vertex)
-                    queue.add(to_vertex)
-                    to_vertex.set_mark()
-        to_vertex = self.get_vertex(to_label)
-        accessible_vertices = self.breadth_first(start_label)
-        return to_vertex in accessible_vertices[1:]
+            for w in v.neighboring_vertices():
+                if w not in visited:
+                    visited.add(w)
+                    yield w
+                    queue.add(w)
 
     def get_distance_matrix(self):
         """
@@ -508,19 +1016,102 @@ class LinkedDirectedGraph(AbstractCollection):
             dist_matrix[row][row] = 0
         return dist_matrix
 
-    def get_all_pairs_shortest_paths(self):
+    def get_all_pairs_shortest_paths(self, predecessors=False, use_numpy=None):
         """
         Returns the shortest paths between all pairs of vertices using Floyd algorithm.
-        """
+        Uses the NumPy engine if it's available, unless use_numpy is False.
+        If predecessors is True, returns a tuple (dist_matrix, pred_matrix),
+        where pred_matrix[r][c] is the label of the vertex before c
+        on the shortest path from r, or None if there's no such path.
+        Raises ImportError if use_numpy is True but NumPy is not installed.
+        """
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        elif use_numpy and numpy is None:
+            raise ImportError("NumPy is required for the vectorized Floyd engine.")
+        if use_numpy:
+            dist_matrix, pred_rows = self.floyd_numpy(predecessors)
+        else:
+            dist_matrix, pred_rows = self.floyd_python(predecessors)
+        if not predecessors:
+            return dist_matrix
+        # Translate predecessor row numbers into labels.
+        labels = [vertex.get_label() for vertex in self]
+        pred_matrix = Grid(len(self), len(self))
+        for r in range(len(self)):
+            for c in range(len(self)):
+                pred = pred_rows[r][c]
+                pred_matrix[r, c] = None if pred < 0 else labels[pred]
+        return dist_matrix, pred_matrix
+
+    def floyd_python(self, predecessors=False):
+        """
+        Helper method for running Floyd algorithm in pure Python.
+        Returns the distance matrix and, if predecessors is True,
+        a list of predecessor rows (-1 for none), or None otherwise.
+        """
+        n = len(self)
         dist_matrix = self.get_distance_matrix()
-        for k in range(len(self)):
-            for r in range(len(self)):
-                for c in range(len(self)):
-                    dist_matrix[r][c] = min_with_inf(
-                        dist_matrix[r][c],
-                        add_with_inf(dist_matrix[r][k], dist_matrix[k][c])
-                    )
-        return dist_matrix
+        pred_rows = None
+        if predecessors:
+            pred_rows = [
+                [r if r != c and dist_matrix[r, c] != INF else -1 for c in range(n)]
+                for r in range(n)
+            ]
+        for k in range(n):
+            for r in range(n):
+                dist_rk = dist_matrix[r, k]
+                if dist_rk == INF:
+                    continue
+                for c in range(n):
+                    new_dist = add_with_inf(dist_rk, dist_matrix[k, c])
+                    if is_less_with_inf(new_dist, dist_matrix[r, c]):
+                        dist_matrix[r, c] = new_dist
+                        if pred_rows is not None:
+                            pred_rows[r][c] = pred_rows[k][c]
+        return dist_matrix, pred_rows
+
+    def floyd_numpy(self, predecessors=False):
+        """
+        Helper method for running Floyd algorithm with NumPy.
+        Each step k relaxes the whole matrix with one broadcast minimum.
+        Returns the distance matrix and, if predecessors is True,
+        a list of predecessor rows (-1 for none), or None otherwise.
+        Raises TypeError if a weight is not a number.
+        """
+        n = len(self)
+        label_table = self.get_label_table()
+        dist = numpy.full((n, n), numpy.inf)
+        numpy.fill_diagonal(dist, 0)
+        is_integral = True
+        for edge in self.edges():
+            weight = edge.get_weight()
+            if not isinstance(weight, (int, float)):
+                raise TypeError(f"Edge {edge} has a non-numeric weight.")
+            is_integral = is_integral and isinstance(weight, int)
+            row = label_table[edge.get_from_vertex().get_label()]
+            col = label_table[edge.get_to_vertex().get_label()]
+            if row != col:
+                dist[row, col] = weight
+        pred = None
+        if predecessors:
+            pred = numpy.where(numpy.isfinite(dist), numpy.arange(n)[:, None], -1)
+            numpy.fill_diagonal(pred, -1)
+        for k in range(n):
+            if pred is None:
+                numpy.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+            else:
+                new_dist = dist[:, k, None] + dist[None, k, :]
+                improved = new_dist < dist
+                dist = numpy.where(improved, new_dist, dist)
+                pred = numpy.where(improved, pred[None, k, :], pred)
+        # Convert back to the INF convention used by the rest of the class.
+        dist_matrix = Grid(n, n, INF)
+        for r, dist_row in enumerate(dist.tolist()):
+            for c, value in enumerate(dist_row):
+                if value != numpy.inf:
+                    dist_matrix[r, c] = int(value) if is_integral else value
+        return dist_matrix, None if pred is None else pred.tolist()
 
     # Mutators
     def clear(self):
@@ -530,6 +1121,52 @@ class LinkedDirectedGraph(AbstractCollection):
         self.edge_count = 0
         self.size = 0
         self.vertices = dict()
+        if self.reachability_index is not None:
+            self.reachability_index.invalidate()
+        if self.topological_order is not None:
+            self.topological_order = DynamicTopologicalOrder(self)
+
+    def build_reachability_index(self):
+        """
+        Builds a ReachabilityIndex for self and returns it.
+        has_path will answer from the index until it's dropped.
+        The index reports its build_time and memory_footprint().
+        """
+        self.reachability_index = ReachabilityIndex(self)
+        return self.reachability_index
+
+    def drop_reachability_index(self):
+        """
+        Stops maintaining the reachability index.
+        """
+        self.reachability_index = None
+
+    def build_topological_order(self):
+        """
+        Builds a DynamicTopologicalOrder for self and returns it.
+        From then on, add_edge raises ValueError on any edge
+        that would create a cycle.
+        Precondition: self is acyclic.
+        Raises ValueError if self has a cycle.
+        """
+        self.topological_order = DynamicTopologicalOrder(self)
+        return self.topological_order
+
+    def drop_topological_order(self):
+        """
+        Stops maintaining the topological order.
+        """
+        self.topological_order = None
+
+    def order_of(self, label):
+        """
+        Returns the position of the label in the maintained topological order.
+        Precondition: build_topological_order has been called.
+        Raises AttributeError if there's no maintained order.
+        """
+        if self.topological_order is None:
+            raise AttributeError("The graph has no maintained topological order.")
+        return self.topological_order.order_of(label)
 
     def clear_edge_marks(self):
         """
@@ -545,6 +1182,17 @@ class LinkedDirectedGraph(AbstractCollection):
         for vertex in self:
             vertex.clear_mark()
 
+    def set_marks(self, vertices, edges):
+        """
+        Clears all marks, then marks the given vertices and edges.
+        """
+        self.clear_vertex_marks()
+        self.clear_edge_marks()
+        for vertex in vertices:
+            vertex.set_mark()
+        for edge in edges:
+            edge.set_mark()
+
     def add_vertex(self, label):
         """
         Adds the vertex to self.
@@ -555,6 +1203,10 @@ class LinkedDirectedGraph(AbstractCollection):
             raise AttributeError(f"Vertex {label} is already in the graph.")
         self.vertices[label] = LinkedVertex(label)
         self.size += 1
+        if self.reachability_index is not None:
+            self.reachability_index.on_add_vertex(label)
+        if self.topological_order is not None:
+            self.topological_order.on_add_vertex(label)
 
     def add(self, label):
         """
@@ -571,28 +1223,67 @@ class LinkedDirectedGraph(AbstractCollection):
             return False
         else:
             # Remove all edges to the removed vertex:
-            for vertex in self.get_vertices():
-                if vertex.remove_edge_to(removed_vertex):
-                    self.edge_count -= 1
+            for vertex in list(removed_vertex.predecessor_vertices()):
+                vertex.remove_edge_to(removed_vertex)
+                self.edge_count -= 1
             # Remove all edges from the removed vertex:
-            for edge in removed_vertex.incident_edges():
+            for vertex in list(removed_vertex.neighboring_vertices()):
+                removed_vertex.remove_edge_to(vertex)
                 self.edge_count -= 1
             # Decrease the vertex count by 1
             self.size -= 1
+            if self.reachability_index is not None:
+                self.reachability_index.invalidate()
+            if self.topological_order is not None:
+                self.topological_order.on_remove_vertex(label)
             return True
 
+    def add_edges(self, edges, weighted=True, trusted=False):
+        """
+        Adds edges from an iterable of (from label, to label, weight) triples,
+        or (from label, to label) pairs if weighted is False.
+        Missing vertices are added as they appear.
+        If trusted is True, the input must not contain edges that are
+        already in self or repeated, and the per-edge duplicate checks
+        are skipped (unless an index or order is maintained on self).
+        """
+        if self.reachability_index is not None or self.topological_order is not None:
+            trusted = False
+        vertices = self.vertices
+        for item in edges:
+            if weighted:
+                from_label, to_label, weight = item
+            else:
+                from_label, to_label = item
+                weight = None
+            if from_label not in vertices:
+                self.add_vertex(from_label)
+            if to_label not in vertices:
+                self.add_vertex(to_label)
+            if trusted:
+                vertices[from_label].link_edge_to(vertices[to_label], weight)
+                self.edge_count += 1
+            else:
+                self.add_edge(from_label, to_label, weight)
+
     def add_edge(self, from_label, to_label, weight=None):
         """
         Adds the edge to self.
         Precondition: The label is not in self.
         Raises AttributeError if the label is in self.
+        Raises ValueError if a topological order is maintained
+        and the edge would create a cycle.
         """
-        if self.contains_edge(from_label, to_label):
-            raise AttributeError(f"Edge {from_label}>{to_label} is already in the graph.")
         from_vertex = self.get_vertex(from_label)
         to_vertex = self.get_vertex(to_label)
+        if from_vertex.has_edge_to(to_vertex):
+            raise AttributeError(f"Edge {from_label}>{to_label} is already in the graph.")
+        if self.topological_order is not None:
+            self.topological_order.on_add_edge(from_label, to_label)
         from_vertex.add_edge_to(to_vertex, weight)
         self.edge_count += 1
+        if self.reachability_index is not None:
+            self.reachability_index.on_add_edge(from_label, to_label)
 
     def remove_edge(self, from_label, to_label):
         """
@@ -603,4 +1294,6 @@ class LinkedDirectedGraph(AbstractCollection):
         removed_edge_flag = from_vertex.remove_edge_to(to_vertex)
         if removed_edge_flag:
             self.edge_count -= 1
+            if self.reachability_index is not None:
+                self.reachability_index.invalidate()
         return removed_edge_flag
@@ -26,6 +26,12 @@ class TwoWayNode(Node):
         self.prev = prev
 
 
+class HashNode(Node):
+    def __init__(self, data, hash_code, next=None):
+        Node.__init__(self, data, next=next)
+        self.hash_code = hash_code
+
+
 class BSTNode(object):
     def __init__(self, data, left=None, right=None):
         self.data = data
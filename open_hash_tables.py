@@ -0,0 +1,150 @@
+from array import array
+
+from arrays import Array
+
+
+class OpenHashTable(object):
+    """
+    A compact open-addressing hash table, in the style of CPython's dict.
+    A typed index Array maps slots to entry positions, and the entries
+    live in parallel arrays of hashes, keys and (optionally) values,
+    in insertion order. Collisions are resolved by perturbed probing,
+    as in CPython, so every bit of the hash takes part in the probe sequence.
+    Used by OpenHashDict, OpenHashBag and OpenHashSet.
+    """
+
+    # Class variables
+    DEFAULT_CAPACITY = 8
+    EMPTY = -1
+    DELETED = -2
+    # Marks the key of a removed entry.
+    DUMMY = object()
+    # Bits of the perturbation shifted out on each probe.
+    PERTURB_SHIFT = 5
+    # Hashes are perturbed as unsigned 64-bit numbers.
+    HASH_MASK = (1 << 64) - 1
+
+    # Constructor
+    def __init__(self, capacity=None, has_values=True):
+        """
+        Sets up room for capacity entries without resizing.
+        If has_values is False, only keys are stored.
+        """
+        self.has_values = has_values
+        self.clear(OpenHashTable.DEFAULT_CAPACITY if capacity is None else capacity)
+
+    # Accessors
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """
+        Supports iteration over the live entry positions, in insertion order.
+        """
+        keys = self.keys
+        for position in range(len(keys)):
+            if keys[position] is not OpenHashTable.DUMMY:
+                yield position
+
+    def find_slot(self, key, hash_code):
+        """
+        Returns (slot, position) for key. position is the entry position
+        of key, or -1 if key is not in self; slot is where key is,
+        or where it should be inserted.
+        Hashes are compared before keys, so __eq__ only runs on real candidates.
+        """
+        index = self.index.items
+        mask = len(index) - 1
+        perturb = hash_code & OpenHashTable.HASH_MASK
+        slot = perturb & mask
+        free_slot = -1
+        while True:
+            position = index[slot]
+            if position == OpenHashTable.EMPTY:
+                return (slot if free_slot < 0 else free_slot), -1
+            if position == OpenHashTable.DELETED:
+                if free_slot < 0:
+                    free_slot = slot
+            elif self.hashes[position] == hash_code:
+                found_key = self.keys[position]
+                if found_key is key or found_key == key:
+                    return slot, position
+            slot = (5 * slot + 1 + perturb) & mask
+            perturb >>= OpenHashTable.PERTURB_SHIFT
+
+    def find_free_slot(self, hash_code):
+        """
+        Returns the first slot where an entry with hash_code can be inserted.
+        Follows the same probe sequence as find_slot.
+        """
+        index = self.index.items
+        mask = len(index) - 1
+        perturb = hash_code & OpenHashTable.HASH_MASK
+        slot = perturb & mask
+        while index[slot] >= 0:
+            slot = (5 * slot + 1 + perturb) & mask
+            perturb >>= OpenHashTable.PERTURB_SHIFT
+        return slot
+
+    def load_factor(self):
+        """
+        Returns the load factor of self.
+        """
+        return self.size / len(self.index)
+
+    # Mutators
+    def clear(self, capacity):
+        """
+        Makes self become empty with room for capacity entries.
+        """
+        table_size = OpenHashTable.DEFAULT_CAPACITY
+        while table_size * 2 < capacity * 3:
+            table_size *= 2
+        self.index = Array(table_size, fill_value=OpenHashTable.EMPTY, typecode="q")
+        self.hashes = array("q")
+        self.keys = []
+        self.values = [] if self.has_values else None
+        self.size = 0
+
+    def insert(self, slot, key, value, hash_code):
+        """
+        Appends a new entry and points slot to it.
+        Precondition: slot came from find_slot or find_free_slot.
+        """
+        self.index[slot] = len(self.keys)
+        self.hashes.append(hash_code)
+        self.keys.append(key)
+        if self.has_values:
+            self.values.append(value)
+        self.size += 1
+        # Used entries (live or removed) never exceed 2/3 of the index.
+        if len(self.keys) * 3 >= len(self.index) * 2:
+            self.resize(self.size)
+
+    def delete(self, slot, position):
+        """
+        Removes the entry at position, which slot points to.
+        """
+        self.index[slot] = OpenHashTable.DELETED
+        self.keys[position] = OpenHashTable.DUMMY
+        if self.has_values:
+            self.values[position] = None
+        self.size -= 1
+
+    def resize(self, capacity):
+        """
+        Rebuilds the index for capacity live entries and drops removed ones.
+        Uses the stored hashes, so hash() is never called again.
+        """
+        positions = list(self)
+        old_hashes, old_keys, old_values = self.hashes, self.keys, self.values
+        self.clear(max(capacity, self.size) * 2)
+        index = self.index.items
+        for position in positions:
+            hash_code = old_hashes[position]
+            index[self.find_free_slot(hash_code)] = len(self.keys)
+            self.hashes.append(hash_code)
+            self.keys.append(old_keys[position])
+            if self.has_values:
+                self.values.append(old_values[position])
+        self.size = len(positions)
@@ -0,0 +1,108 @@
+import sys
+import time
+
+
+class ReachabilityIndex(object):
+    """
+    A transitive-closure index over a LinkedDirectedGraph.
+    Strongly connected components are condensed first, and each component
+    keeps a bitset (a Python int) of the components it can reach
+    through at least one edge.
+    Adding vertices and edges updates the index in place; anything else
+    makes it stale, and it's rebuilt on the next query.
+    """
+
+    # Constructor
+    def __init__(self, graph):
+        self.graph = graph
+        self.build()
+
+    # Accessors
+    def has_path(self, start_label, to_label):
+        """
+        Returns True if there's a path between two vertices, or False otherwise.
+        """
+        if self.is_stale:
+            self.build()
+        start = self.component_table.get(start_label, None)
+        target = self.component_table.get(to_label, None)
+        if start is None or target is None:
+            return False
+        return (self.reach[start] >> target) & 1 == 1
+
+    def memory_footprint(self):
+        """
+        Returns the approximate number of bytes used by self.
+        """
+        total = sys.getsizeof(self.component_table) + sys.getsizeof(self.reach)
+        for bits in self.reach:
+            total += sys.getsizeof(bits)
+        return total
+
+    def size_components(self):
+        """
+        Returns the number of strongly connected components.
+        """
+        return len(self.reach)
+
+    # Mutators
+    def build(self):
+        """
+        Rebuilds the index from the graph and records the build time in seconds.
+        """
+        start_time = time.perf_counter()
+        # Reverse topological order: every successor component
+        # is finished before the components reaching it.
+        components = self.graph.strongly_connected_components()
+        components.reverse()
+        component_of = dict()
+        self.reach = [0] * len(components)
+        for c, members in enumerate(components):
+            for vertex in members:
+                component_of[vertex] = c
+            bits = 0
+            for vertex in members:
+                for edge in vertex.incident_edges():
+                    d = component_of[edge.get_to_vertex()]
+                    if d == c:
+                        bits |= 1 << c
+                    else:
+                        bits |= (1 << d) | self.reach[d]
+            self.reach[c] = bits
+        self.component_table = {vertex.get_label(): c for vertex, c in component_of.items()}
+        self.is_stale = False
+        self.build_time = time.perf_counter() - start_time
+
+    def invalidate(self):
+        """
+        Marks self as stale, so it's rebuilt on the next query.
+        """
+        self.is_stale = True
+
+    def on_add_vertex(self, label):
+        """
+        Updates self after a vertex is added to the graph.
+        """
+        if not self.is_stale:
+            self.component_table[label] = len(self.reach)
+            self.reach.append(0)
+
+    def on_add_edge(self, from_label, to_label):
+        """
+        Updates self after an edge is added to the graph.
+        Every component reaching the edge's source now also reaches
+        everything its target reaches. Closing a cycle between two
+        components merges them, so self becomes stale instead.
+        """
+        if self.is_stale:
+            return
+        source = self.component_table[from_label]
+        target = self.component_table[to_label]
+        if source != target and (self.reach[target] >> source) & 1:
+            self.invalidate()
+            return
+        new_bits = (1 << target) | self.reach[target]
+        source_bit = 1 << source
+        for c in range(len(self.reach)):
+            if c == source or self.reach[c] & source_bit:
+                self.reach[c] |= new_bits
@@ -12,7 +12,8 @@ class ArrayStack(AbstractStack):
     DEFAULT_CAPACITY = 10
 
     # Constructor
-    def __init__(self, source_collection=None):
+    def __init__(self, source_collection=None, typecode=None):
+        self.typecode = typecode
         self.clear()
         AbstractStack.__init__(self, source_collection)
 
@@ -42,7 +43,7 @@ class ArrayStack(AbstractStack):
         """
         Makes self become empty.
         """
-        self.items = Array(ArrayStack.DEFAULT_CAPACITY)
+        self.items = Array(ArrayStack.DEFAULT_CAPACITY, typecode=self.typecode)
         self.size = 0
 
     def push(self, item):
@@ -0,0 +1,122 @@
+class DynamicTopologicalOrder(object):
+    """
+    A topological order of a LinkedDirectedGraph that is kept up to date
+    as vertices and edges change, using the Pearce-Kelly algorithm.
+    Only the vertices between the two ends of a new edge are ever reordered.
+    """
+
+    # Constructor
+    def __init__(self, graph):
+        """
+        Precondition: graph is acyclic.
+        Raises ValueError if graph has a cycle.
+        order_table: {label: position}
+        position_table: {position: label}
+        """
+        self.graph = graph
+        self.order_table = dict()
+        self.position_table = dict()
+        self.next_position = 0
+        for vertex in graph.topological_sort(strict=True):
+            self.on_add_vertex(vertex.get_label())
+
+    # Accessors
+    def __len__(self):
+        return len(self.order_table)
+
+    def __iter__(self):
+        """
+        Supports iteration over the labels in topological order.
+        """
+        for position in sorted(self.position_table):
+            yield self.position_table[position]
+
+    def order_of(self, label):
+        """
+        Returns the position of the label; every edge goes from
+        a smaller position to a larger one.
+        Precondition: The label is in the graph.
+        Raises AttributeError if the label is not in the graph.
+        """
+        position = self.order_table.get(label, None)
+        if position is None:
+            raise AttributeError(f"Vertex {label} is not in the graph.")
+        return position
+
+    # Mutators
+    def on_add_vertex(self, label):
+        """
+        Places a new vertex at the end of the order.
+        """
+        self.order_table[label] = self.next_position
+        self.position_table[self.next_position] = label
+        self.next_position += 1
+
+    def on_remove_vertex(self, label):
+        """
+        Drops a removed vertex; the order of the others stays valid.
+        """
+        position = self.order_table.pop(label)
+        del self.position_table[position]
+
+    def on_set_label(self, old_label, new_label):
+        """
+        Moves the position of a relabeled vertex to its new label.
+        """
+        position = self.order_table.pop(old_label)
+        self.order_table[new_label] = position
+        self.position_table[position] = new_label
+
+    def on_add_edge(self, from_label, to_label):
+        """
+        Updates self before an edge is added to the graph.
+        Raises ValueError if the edge would create a cycle,
+        leaving both self and the graph unchanged.
+        """
+        lower = self.order_table[to_label]
+        upper = self.order_table[from_label]
+        if upper < lower:
+            return
+        # Vertices reachable from to_label that sit before from_label.
+        forward = self.search(
+            self.graph.get_vertex(to_label),
+            lambda vertex: vertex.neighboring_vertices(),
+            lambda position: position <= upper,
+            from_label,
+        )
+        # Vertices reaching from_label that sit after to_label.
+        backward = self.search(
+            self.graph.get_vertex(from_label),
+            lambda vertex: vertex.predecessor_vertices(),
+            lambda position: position >= lower,
+            None,
+        )
+        # Reuse the freed positions: everything in backward goes first.
+        backward.sort(key=lambda label: self.order_table[label])
+        forward.sort(key=lambda label: self.order_table[label])
+        positions = sorted(self.order_table[label] for label in backward + forward)
+        for position, label in zip(positions, backward + forward):
+            self.order_table[label] = position
+            self.position_table[position] = label
+
+    def search(self, start_vertex, next_vertices, is_affected, cycle_label):
+        """
+        Helper method for collecting the labels reachable from start_vertex
+        through vertices whose position is affected.
+        Raises ValueError if cycle_label is reached.
+        """
+        start_label = start_vertex.get_label()
+        if start_label == cycle_label:
+            raise ValueError(f"Edge {cycle_label}>{cycle_label} would create a cycle.")
+        visited = set([start_label])
+        stack = [start_vertex]
+        while stack:
+            vertex = stack.pop()
+            for other in next_vertices(vertex):
+                label = other.get_label()
+                if label == cycle_label:
+                    raise ValueError(f"Edge {cycle_label}>{start_label} would create a cycle.")
+                if label not in visited and is_affected(self.order_table[label]):
+                    visited.add(label)
+                    stack.append(other)
+        return list(visited)